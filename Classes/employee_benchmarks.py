@@ -0,0 +1,310 @@
+"""
+Benchmarks comparing the object-per-employee Company with the columnar ColumnarCompany.
+
+Class(es):
+    None
+
+Function(s):
+    build_company(Company, int) -> Company
+    benchmark_storage(int) -> None
+    benchmark_year_end(int) -> None
+    benchmark_persistence(int) -> None
+    build_org_chart(Company, int) -> None
+    benchmark_org_chart(int) -> None
+    benchmark_ledger(int, int, int) -> None
+    main() -> None
+"""
+
+import io
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+from employee_mgmt import (
+    ColumnarCompany,
+    Company,
+    HourlyEmployee,
+    Role,
+    SalariedEmployee,
+    VacationDaysShortageError,
+    VacationLedger,
+)
+from employee_store import EmployeeStore
+
+FIRST_NAMES = ["Gregg", "Tom", "Bob", "Craig", "Kristin", "Anna", "Li", "Maria", "Sam", "Omar"]
+
+
+def build_company(company: Company, n: int, seed: int = 42) -> Company:
+    """
+    Fill a company with n randomly generated employees.
+
+    Args:
+        company (Company): Empty company to fill
+        n (int): Number of employees to add
+        seed (int, optional): Random seed. Defaults to 42.
+
+    Returns:
+        Company: The filled company
+    """
+
+    rng = random.Random(seed)
+    roles = list(Role)
+
+    for i in range(n):
+        name = f"{rng.choice(FIRST_NAMES)}{i % 1000}"
+        role = rng.choice(roles)
+        vacation_days = rng.randint(0, 30)
+
+        if rng.random() < 0.5:
+            employee = HourlyEmployee(
+                name=name,
+                role=role,
+                vacation_days=vacation_days,
+                hourly_rate=rng.randint(15, 120),
+                hours_worked=rng.randint(10, 80),
+            )
+        else:
+            employee = SalariedEmployee(
+                name=name,
+                role=role,
+                vacation_days=vacation_days,
+                biweekly_salary=float(rng.randint(2_000, 12_000)),
+            )
+
+        company.add_employee(employee)
+
+    return company
+
+
+def benchmark_storage(n: int) -> None:
+    """
+    Compare memory per employee and aggregate report speed of both company types.
+
+    Args:
+        n (int): Number of employees
+    """
+
+    for company_type in (Company, ColumnarCompany):
+        tracemalloc.start()
+        company = build_company(company_type(), n)
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{company_type.__name__}: {memory / n:.1f} bytes per employee")
+
+        start = time.perf_counter()
+        company.headcount_by_role()
+        end = time.perf_counter()
+        print(f"{company_type.__name__}.headcount_by_role(): {end-start:.03f} seconds")
+
+        start = time.perf_counter()
+        company.total_payroll()
+        end = time.perf_counter()
+        print(f"{company_type.__name__}.total_payroll(): {end-start:.03f} seconds")
+
+        start = time.perf_counter()
+        company.find_employee(Role.PRESIDENT)
+        end = time.perf_counter()
+        print(f"{company_type.__name__}.find_employee(): {end-start:.03f} seconds")
+
+        del company
+
+
+def benchmark_year_end(n: int) -> None:
+    """
+    Compare a per-employee year-end accrual/payout loop with the bulk Company operations.
+
+    Args:
+        n (int): Number of employees
+    """
+
+    company = build_company(Company(), n)
+    shortages = 0
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for employee in company.employees:
+            employee.vacation_days += 1
+            try:
+                employee.payout_holiday()
+            except VacationDaysShortageError:
+                shortages += 1
+    end = time.perf_counter()
+    print(f"Per-employee accrual and payout_holiday(): {end-start:.03f} seconds")
+
+    for company_type in (Company, ColumnarCompany):
+        company = build_company(company_type(), n)
+        start = time.perf_counter()
+        company.accrue_vacation(1)
+        company.payout_holidays()
+        end = time.perf_counter()
+        print(
+            f"{company_type.__name__}.accrue_vacation() + payout_holidays(): "
+            f"{end-start:.03f} seconds"
+        )
+
+
+def benchmark_persistence(n: int) -> None:
+    """
+    Time a full save, an incremental save after a single change, and a streamed load.
+
+    Args:
+        n (int): Number of employees
+    """
+
+    for company_type in (Company, ColumnarCompany):
+        company = build_company(company_type(), n)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with EmployeeStore(os.path.join(directory, "company.db")) as store:
+                start = time.perf_counter()
+                store.save(company)
+                end = time.perf_counter()
+                print(f"{company_type.__name__} full save: {end-start:.03f} seconds")
+
+                company.employees[n // 2].vacation_days += 1
+                start = time.perf_counter()
+                rows = store.save(company)
+                end = time.perf_counter()
+                print(
+                    f"{company_type.__name__} incremental save ({rows} row): "
+                    f"{end-start:.03f} seconds"
+                )
+
+                start = time.perf_counter()
+                store.load(company_type())
+                end = time.perf_counter()
+                print(f"{company_type.__name__} load: {end-start:.03f} seconds")
+
+
+def build_org_chart(company: Company, seed: int = 42) -> None:
+    """
+    Give every employee but the first a random manager, forming a tree about eight levels deep.
+
+    Args:
+        company (Company): Company to organize
+        seed (int, optional): Random seed. Defaults to 42.
+    """
+
+    rng = random.Random(seed)
+    company.assign_managers(
+        {
+            employee_id: rng.randrange(employee_id // 10, employee_id // 5 + 1)
+            for employee_id in range(1, len(company.employees))
+        }
+    )
+
+
+def benchmark_org_chart(n: int) -> None:
+    """
+    Compare org queries on the OrgChart index against traversing direct reports.
+
+    Args:
+        n (int): Number of employees
+    """
+
+    company = build_company(ColumnarCompany(), n)
+
+    start = time.perf_counter()
+    build_org_chart(company)
+    end = time.perf_counter()
+    print(f"Building org chart for {n} employees: {end-start:.03f} seconds")
+
+    direct_reports: list[list[int]] = [[] for _ in range(n)]
+    for employee_id, manager_id in enumerate(company.org_chart.managers):
+        if manager_id != -1:
+            direct_reports[manager_id].append(employee_id)
+
+    manager_id = 3
+    start = time.perf_counter()
+    headcount, payroll, stack = 0, 0.0, [manager_id]
+    while stack:
+        member = stack.pop()
+        headcount += 1
+        payroll += company.employees[member].period_pay
+        stack.extend(direct_reports[member])
+    end = time.perf_counter()
+    print(f"Traversal headcount ({headcount}) and payroll: {end-start:.06f} seconds")
+
+    start = time.perf_counter()
+    headcount = company.org_headcount(manager_id)
+    end = time.perf_counter()
+    print(f"OrgChart headcount ({headcount}): {end-start:.06f} seconds")
+
+    start = time.perf_counter()
+    payroll = company.org_payroll(manager_id)
+    end = time.perf_counter()
+    print(f"OrgChart payroll: {end-start:.06f} seconds")
+
+    start = time.perf_counter()
+    for employee_id in range(n - 1_000, n):
+        company.assign_manager(employee_id, manager_id)
+    end = time.perf_counter()
+    print(f"1000 single reassignments: {end-start:.03f} seconds")
+
+
+def benchmark_ledger(n: int, threads: int, requests: int) -> None:
+    """
+    Time a VacationLedger serving holiday requests for a small pool of employees from many
+    threads.  Its correctness under contention is covered by tests/test_employee_ledger.py.
+
+    Args:
+        n (int): Number of employees
+        threads (int): Number of worker threads
+        requests (int): Holiday requests per thread
+    """
+
+    for company_type in (Company, ColumnarCompany):
+        company = build_company(company_type(), n)
+        initial = [employee.vacation_days for employee in company.employees]
+        ledger = VacationLedger(company)
+
+        def single_requests(seed: int) -> None:
+            rng = random.Random(seed)
+            for _ in range(requests):
+                try:
+                    ledger.take_holiday(rng.randrange(n))
+                except VacationDaysShortageError:
+                    pass
+
+        def batch_requests(seed: int) -> None:
+            rng = random.Random(seed)
+            for _ in range(requests // 10):
+                try:
+                    ledger.commit({rng.randrange(n): -1 for _ in range(10)})
+                except VacationDaysShortageError:
+                    pass
+
+        for worker in (single_requests, batch_requests):
+            for employee, days in zip(company.employees, initial):
+                employee.vacation_days = days
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(worker, range(threads)))
+            end = time.perf_counter()
+
+            print(
+                f"{company_type.__name__} {worker.__name__}: "
+                f"{threads * requests / (end - start):,.0f} requests/second"
+            )
+
+
+def main() -> None:
+    """
+    Module run method.
+    """
+
+    n = 1_000_000
+
+    benchmark_storage(n)
+    benchmark_year_end(n)
+    benchmark_persistence(n)
+    benchmark_org_chart(n)
+    benchmark_ledger(n=100, threads=8, requests=20_000)
+
+
+if __name__ == "__main__":
+    main()
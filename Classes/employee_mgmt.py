@@ -4,19 +4,34 @@ Example employee management system.
 Class(es):
     VacationDaysShortageError
     Role
+    VacationPayoutReport
     Employee
     HourlyEmployee
     SalariedEmployee
+    OrgChart
     Company
+    VacationLedger
+    EmployeeView
+    HourlyEmployeeView
+    SalariedEmployeeView
+    EmployeeColumns
+    ColumnarCompany
 
 Function(s):
     main(None) -> None
 """
 
+import sys
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from array import array
+from collections.abc import Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List
+from itertools import compress
+from operator import mul
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Union, overload
 
 MAX_FIXED_VACATION_DAYS_PAYOUT = (
     5  # The maximum fixed amount of vacation days that can be paid out
@@ -49,6 +64,18 @@ class Role(Enum):
     INTERN = auto()
 
 
+@dataclass
+class VacationPayoutReport:
+    """
+    Outcome of a bulk vacation payout.  Employees without any vacation days left are collected
+    in shortages instead of raising a VacationDaysShortageError each.
+    """
+
+    employees_paid: int = 0
+    days_paid: int = 0
+    shortages: List["Employee"] = field(default_factory=list)
+
+
 @dataclass
 class Employee(ABC):
     """
@@ -65,6 +92,13 @@ class Employee(ABC):
         Method to call when paying an employee.
         """
 
+    @property
+    @abstractmethod
+    def period_pay(self) -> float:
+        """
+        Amount paid to the employee for one biweekly pay period.
+        """
+
     def take_holiday(self) -> None:
         """
         Update employee's remaining vacation days.
@@ -95,6 +129,7 @@ class Employee(ABC):
         if self.vacation_days < MAX_FIXED_VACATION_DAYS_PAYOUT:
             print(f"Paying out remaining {self.vacation_days} vacation day(s).")
             self.vacation_days = 0
+            return
 
         self.vacation_days -= MAX_FIXED_VACATION_DAYS_PAYOUT
         print(f"Paying out vacation days.  Vacation days left: {self.vacation_days}")
@@ -114,6 +149,10 @@ class HourlyEmployee(Employee):
             f"Paying employee {self.name} for {self.hours_worked} hours at ${self.hourly_rate}/hr."
         )
 
+    @property
+    def period_pay(self) -> float:
+        return self.hourly_rate * self.hours_worked
+
 
 @dataclass
 class SalariedEmployee(Employee):
@@ -126,6 +165,298 @@ class SalariedEmployee(Employee):
     def pay(self) -> None:
         print(f"Paying employee {self.name} biweekly salary of {self.biweekly_salary}.")
 
+    @property
+    def period_pay(self) -> float:
+        return self.biweekly_salary
+
+
+# Gap between neighbouring tour labels after a full relabel, and the largest label handed out
+TOUR_LABEL_SPACING = 2**32
+TOUR_LABEL_MAX = 2**62
+
+
+class OrgChart:
+    """
+    Reporting-line index over employee ids (positions in Company.employees).
+
+    Employees are kept in an Euler-tour order - a linked list where everyone reporting up to a
+    manager sits in one contiguous block directly after them.  Each employee carries an ordered
+    integer label and a pointer to the end of their block, so "does X report to Y" is two label
+    comparisons, headcounts are a lookup, and listing an org walks only its k members.
+
+    Reassigning someone unlinks their block and splices it after the new manager's block, then
+    relabels just the moved block (or, if the label gap there is exhausted, a small window around
+    it).  Cost is O(k + depth) rather than a rebuild of the whole index.
+
+    Instance Attributes:
+        managers (array[int]): Direct manager of each employee, -1 for none
+        org_size (array[int]): Size of each employee's org, including themselves
+        org_end (array[int]): Last employee in the tour block of each employee's org
+        labels (array[int]): Tour order labels, increasing along the tour
+        following (array[int]): Next employee in the tour, -1 at the end
+        preceding (array[int]): Previous employee in the tour, -1 at the start
+    """
+
+    def __init__(self) -> None:
+        self.managers = array("l")
+        self.org_size = array("l")
+        self.org_end = array("l")
+        self.labels = array("q")
+        self.following = array("l")
+        self.preceding = array("l")
+        self._head = -1
+        self._tail = -1
+
+    def add(self) -> int:
+        """
+        Add an employee with no manager.
+
+        Returns:
+            int: The new employee's id
+        """
+
+        employee_id = len(self.managers)
+        self.managers.append(-1)
+        self.org_size.append(1)
+        self.org_end.append(employee_id)
+        self.labels.append(0)
+        self.following.append(-1)
+        self.preceding.append(-1)
+
+        self._link(employee_id, employee_id, self._tail)
+        self._label(employee_id, employee_id)
+
+        return employee_id
+
+    def reports_to(self, employee_id: int, manager_id: int) -> bool:
+        """
+        Check whether an employee reports, directly or indirectly, to a manager.
+
+        Args:
+            employee_id (int): Employee to check
+            manager_id (int): Manager to check against
+
+        Returns:
+            bool: True if employee_id is in manager_id's org (and isn't manager_id)
+        """
+
+        labels = self.labels
+        return labels[manager_id] < labels[employee_id] <= labels[self.org_end[manager_id]]
+
+    def org(self, manager_id: int) -> List[int]:
+        """
+        Ids of a manager and everyone reporting up to them.
+
+        Args:
+            manager_id (int): Manager whose org is requested
+
+        Returns:
+            List[int]: Employee ids, manager first
+        """
+
+        following = self.following
+        members = [manager_id]
+        for _ in range(self.org_size[manager_id] - 1):
+            members.append(following[members[-1]])
+
+        return members
+
+    def chain_of_command(self, employee_id: int) -> List[int]:
+        """
+        Ids of an employee's managers, from their direct manager up to the top.
+
+        Args:
+            employee_id (int): Employee to look up
+
+        Returns:
+            List[int]: Manager ids, nearest first
+        """
+
+        chain = []
+        manager_id = self.managers[employee_id]
+        while manager_id != -1:
+            chain.append(manager_id)
+            manager_id = self.managers[manager_id]
+
+        return chain
+
+    def assign(self, employee_id: int, manager_id: Optional[int]) -> None:
+        """
+        Make an employee (and their whole org) report to a new manager.
+
+        Args:
+            employee_id (int): Employee being reassigned
+            manager_id (Optional[int]): New manager, or None to report to nobody
+
+        Raises:
+            ValueError: The new manager is the employee or someone in their org
+        """
+
+        if manager_id is not None and (
+            manager_id == employee_id or self.reports_to(manager_id, employee_id)
+        ):
+            raise ValueError(f"Employee {manager_id} reports to employee {employee_id}")
+
+        first, last = employee_id, self.org_end[employee_id]
+        size = self.org_size[employee_id]
+
+        # Detach the block from the old managers...
+        before = self.preceding[first]
+        for ancestor in self.chain_of_command(employee_id):
+            self.org_size[ancestor] -= size
+            if self.org_end[ancestor] == last:
+                self.org_end[ancestor] = before
+        self._unlink(first, last)
+
+        # ...and splice it in at the end of the new manager's block (or the end of the tour)
+        if manager_id is None:
+            self.managers[employee_id] = -1
+            self._link(first, last, self._tail)
+        else:
+            self.managers[employee_id] = manager_id
+            end = self.org_end[manager_id]
+            for ancestor in [manager_id, *self.chain_of_command(manager_id)]:
+                self.org_size[ancestor] += size
+                if self.org_end[ancestor] == end:
+                    self.org_end[ancestor] = last
+            self._link(first, last, end)
+
+        self._label(first, last)
+
+    def assign_many(self, assignments: Dict[int, Optional[int]]) -> None:
+        """
+        Apply many reassignments at once and rebuild the index in a single O(n) pass.  Cheaper
+        than repeated assign() calls when loading or restructuring a large part of the company.
+
+        Args:
+            assignments (Dict[int, Optional[int]]): New manager (or None) keyed by employee id
+
+        Raises:
+            ValueError: The assignments would make someone report to themselves
+        """
+
+        previous = array("l", self.managers)
+        for employee_id, manager_id in assignments.items():
+            self.managers[employee_id] = -1 if manager_id is None else manager_id
+
+        try:
+            self._rebuild()
+        except ValueError:
+            self.managers = previous
+            raise
+
+    def _unlink(self, first: int, last: int) -> None:
+        """
+        Cut the tour segment first..last out of the linked list.
+        """
+
+        before, after = self.preceding[first], self.following[last]
+        if before == -1:
+            self._head = after
+        else:
+            self.following[before] = after
+        if after == -1:
+            self._tail = before
+        else:
+            self.preceding[after] = before
+
+        self.preceding[first] = self.following[last] = -1
+
+    def _link(self, first: int, last: int, before: int) -> None:
+        """
+        Splice the detached tour segment first..last in after before (-1 for the start).
+        """
+
+        after = self._head if before == -1 else self.following[before]
+        self.preceding[first], self.following[last] = before, after
+        if before == -1:
+            self._head = first
+        else:
+            self.following[before] = first
+        if after == -1:
+            self._tail = last
+        else:
+            self.preceding[after] = last
+
+    def _label(self, first: int, last: int) -> None:
+        """
+        Give the tour segment first..last labels between those of its neighbours.  If the gap is
+        too small the segment is widened on both sides, growing geometrically, until it fits.
+        """
+
+        labels, following, preceding = self.labels, self.following, self.preceding
+        count = 1
+        node = first
+        while node != last:
+            node = following[node]
+            count += 1
+
+        while True:
+            before, after = preceding[first], following[last]
+            low = labels[before] if before != -1 else 0
+            if after != -1:
+                high = labels[after]
+            else:
+                high = min(TOUR_LABEL_MAX, low + (count + 1) * TOUR_LABEL_SPACING)
+
+            step = (high - low) // (count + 1)
+            if step > 0:
+                break
+
+            for _ in range(count):
+                if preceding[first] != -1:
+                    first = preceding[first]
+                    count += 1
+                if following[last] != -1:
+                    last = following[last]
+                    count += 1
+
+        node = first
+        for index in range(1, count + 1):
+            labels[node] = low + index * step
+            node = following[node]
+
+    def _rebuild(self) -> None:
+        """
+        Recompute the tour, labels and org sizes from managers.
+        """
+
+        count = len(self.managers)
+        reports: List[List[int]] = [[] for _ in range(count)]
+        top: List[int] = []
+        for employee_id, manager_id in enumerate(self.managers):
+            (top if manager_id == -1 else reports[manager_id]).append(employee_id)
+
+        tour = array("l")
+        stack = top[::-1]
+        while stack:
+            employee_id = stack.pop()
+            tour.append(employee_id)
+            stack.extend(reversed(reports[employee_id]))
+
+        if len(tour) != count:
+            raise ValueError("Reporting lines contain a cycle")
+
+        org_size = array("l", [1]) * count
+        for employee_id in reversed(tour):
+            manager_id = self.managers[employee_id]
+            if manager_id != -1:
+                org_size[manager_id] += org_size[employee_id]
+
+        spacing = min(TOUR_LABEL_SPACING, TOUR_LABEL_MAX // (count + 1))
+        labels, org_end = array("q", [0]) * count, array("l", [0]) * count
+        following, preceding = array("l", [-1]) * count, array("l", [-1]) * count
+        for index, employee_id in enumerate(tour):
+            labels[employee_id] = (index + 1) * spacing
+            org_end[employee_id] = tour[index + org_size[employee_id] - 1]
+            if index:
+                preceding[employee_id] = tour[index - 1]
+                following[tour[index - 1]] = employee_id
+
+        self.org_size, self.org_end, self.labels = org_size, org_end, labels
+        self.following, self.preceding = following, preceding
+        self._head, self._tail = (tour[0], tour[-1]) if count else (-1, -1)
+
 
 class Company:
     """
@@ -134,16 +465,95 @@ class Company:
 
     def __init__(self) -> None:
         self.employees: List[Employee] = []
+        self.org_chart = OrgChart()
 
-    def add_employee(self, employee: Employee) -> None:
+    def add_employee(self, employee: Employee) -> int:
         """
         Add employee to employee list.
 
         Args:
             employee (Employee): Employee to add
+
+        Returns:
+            int: The employee's id, i.e. their position in the employee list
         """
 
         self.employees.append(employee)
+        return self.org_chart.add()
+
+    def assign_manager(self, employee_id: int, manager_id: Optional[int]) -> None:
+        """
+        Set who an employee reports to.  The employee's own reports move with them.
+
+        Args:
+            employee_id (int): Employee being assigned
+            manager_id (Optional[int]): New manager, or None to report to nobody
+        """
+
+        self.org_chart.assign(employee_id, manager_id)
+
+    def assign_managers(self, assignments: Dict[int, Optional[int]]) -> None:
+        """
+        Set many reporting lines at once, e.g. when loading an org chart.
+
+        Args:
+            assignments (Dict[int, Optional[int]]): New manager (or None) keyed by employee id
+        """
+
+        self.org_chart.assign_many(assignments)
+
+    def reports_to(self, employee_id: int, manager_id: int) -> bool:
+        """
+        Check whether an employee reports, directly or indirectly, to a manager.
+
+        Args:
+            employee_id (int): Employee to check
+            manager_id (int): Manager to check against
+
+        Returns:
+            bool: True if the employee is somewhere under the manager
+        """
+
+        return self.org_chart.reports_to(employee_id, manager_id)
+
+    def org_members(self, manager_id: int) -> List[Employee]:
+        """
+        Find a manager and everyone reporting up to them.
+
+        Args:
+            manager_id (int): Manager whose org is requested
+
+        Returns:
+            List[Employee]: The manager followed by their direct and indirect reports
+        """
+
+        return [self.employees[member] for member in self.org_chart.org(manager_id)]
+
+    def org_headcount(self, manager_id: int) -> int:
+        """
+        Count a manager and everyone reporting up to them.
+
+        Args:
+            manager_id (int): Manager whose org is counted
+
+        Returns:
+            int: Org headcount, including the manager
+        """
+
+        return self.org_chart.org_size[manager_id]
+
+    def org_payroll(self, manager_id: int) -> float:
+        """
+        Roll up one pay period's payroll for a manager's org.
+
+        Args:
+            manager_id (int): Manager whose org is rolled up
+
+        Returns:
+            float: Payroll total, including the manager
+        """
+
+        return sum(self.employees[member].period_pay for member in self.org_chart.org(manager_id))
 
     def find_employee(self, role: Role) -> List[Employee]:
         """
@@ -158,6 +568,510 @@ class Company:
 
         return [employee for employee in self.employees if employee.role is role]
 
+    def headcount_by_role(self) -> Dict[Role, int]:
+        """
+        Count the employees holding each role.
+
+        Returns:
+            Dict[Role, int]: Number of employees per role
+        """
+
+        headcount = dict.fromkeys(Role, 0)
+        for employee in self.employees:
+            headcount[employee.role] += 1
+
+        return headcount
+
+    def total_payroll(self) -> float:
+        """
+        Total amount paid out to all employees for one biweekly pay period.
+
+        Returns:
+            float: Payroll total
+        """
+
+        return sum(employee.period_pay for employee in self.employees)
+
+    def accrue_vacation(self, days: int = 1) -> None:
+        """
+        Add vacation days to every employee's balance.  Not synchronized: while a VacationLedger
+        manages this company, use its accrue_vacation instead.
+
+        Args:
+            days (int, optional): Days to add to each employee. Defaults to 1.
+
+        Raises:
+            ValueError: days must not be negative
+        """
+
+        if days < 0:
+            raise ValueError(f"Expect non-negative days, got {days}")
+
+        for employee in self.employees:
+            employee.vacation_days += days
+
+    def payout_holidays(self) -> VacationPayoutReport:
+        """
+        Pay out unused vacation days for every employee, up to MAX_FIXED_VACATION_DAYS_PAYOUT
+        days each.  Not synchronized: while a VacationLedger manages this company, use its
+        payout_holidays instead.
+
+        Returns:
+            VacationPayoutReport: Totals paid and employees with no days to pay out
+        """
+
+        report = VacationPayoutReport()
+
+        for employee in self.employees:
+            days = employee.vacation_days
+            if days < 1:
+                report.shortages.append(employee)
+                continue
+
+            paid = min(days, MAX_FIXED_VACATION_DAYS_PAYOUT)
+            employee.vacation_days = days - paid
+            report.employees_paid += 1
+            report.days_paid += paid
+
+        return report
+
+
+class VacationLedger:
+    """
+    Thread-safe front end for changing employees' vacation balances.  Each employee id maps onto
+    one of a fixed set of striped locks, so the check and the update of a balance happen under the
+    same lock and concurrent requests can't overdraw it, while requests for employees on other
+    stripes run without contention.  Bulk accruals and payouts hold every stripe, so while a
+    ledger is in use they must go through it rather than straight to the company.
+
+    Instance Attributes:
+        company (Company): Company whose balances are managed
+        locks (list[threading.Lock]): Lock stripes
+    """
+
+    def __init__(self, company: Company, stripes: int = 64) -> None:
+        """
+        Initialize ledger for a company.
+
+        Args:
+            company (Company): Company whose balances are managed
+            stripes (int, optional): Number of locks to spread employees over. Defaults to 64.
+        """
+
+        self.company = company
+        self.locks = [threading.Lock() for _ in range(stripes)]
+
+    def balance(self, employee_id: int) -> int:
+        """
+        Read an employee's current vacation balance.
+
+        Args:
+            employee_id (int): Employee to look up
+
+        Returns:
+            int: Remaining vacation days
+        """
+
+        with self.locks[employee_id % len(self.locks)]:
+            return self.company.employees[employee_id].vacation_days
+
+    def take_holiday(self, employee_id: int, days: int = 1) -> int:
+        """
+        Atomically check and deduct vacation days from an employee's balance.
+
+        Args:
+            employee_id (int): Employee taking the holiday
+            days (int, optional): Days requested. Defaults to 1.
+
+        Raises:
+            ValueError: days must be a positive integer
+            VacationDaysShortageError: Not enough days left; the balance is left untouched
+
+        Returns:
+            int: Remaining vacation days
+        """
+
+        if days < 1:
+            raise ValueError(f"Expect positive days, got {days}")
+
+        employee = self.company.employees[employee_id]
+        with self.locks[employee_id % len(self.locks)]:
+            remaining = employee.vacation_days
+            if remaining < days:
+                raise VacationDaysShortageError(
+                    requested_days=days,
+                    remaining_days=remaining,
+                    message=f"{employee.name}, you don't have enough vacation days remaining.",
+                )
+            employee.vacation_days = remaining - days
+
+        return remaining - days
+
+    def commit(self, changes: Mapping[int, int]) -> None:
+        """
+        Apply a batch of balance changes all-or-nothing.  The stripes involved are locked in a
+        fixed order, every resulting balance is checked, and only then are the changes written.
+
+        Args:
+            changes (Mapping[int, int]): Change in days (negative to take) keyed by employee id
+
+        Raises:
+            VacationDaysShortageError: A change would overdraw a balance; nothing is applied
+        """
+
+        employees = self.company.employees
+        stripes = sorted({employee_id % len(self.locks) for employee_id in changes})
+
+        with self._holding(stripes):
+            updated = {}
+            for employee_id, change in changes.items():
+                employee = employees[employee_id]
+                remaining = employee.vacation_days
+                if remaining + change < 0:
+                    raise VacationDaysShortageError(
+                        requested_days=-change,
+                        remaining_days=remaining,
+                        message=f"{employee.name}, you don't have enough vacation days remaining.",
+                    )
+                updated[employee_id] = remaining + change
+
+            for employee_id, days in updated.items():
+                employees[employee_id].vacation_days = days
+
+    def accrue_vacation(self, days: int = 1) -> None:
+        """
+        Company.accrue_vacation, holding every stripe so no request runs halfway through it.
+
+        Args:
+            days (int, optional): Days to add to each employee. Defaults to 1.
+
+        Raises:
+            ValueError: days must not be negative
+        """
+
+        with self._holding(range(len(self.locks))):
+            self.company.accrue_vacation(days)
+
+    def payout_holidays(self) -> VacationPayoutReport:
+        """
+        Company.payout_holidays, holding every stripe so no request runs halfway through it.
+
+        Returns:
+            VacationPayoutReport: Totals paid and employees with no days to pay out
+        """
+
+        with self._holding(range(len(self.locks))):
+            return self.company.payout_holidays()
+
+    @contextmanager
+    def _holding(self, stripes: Iterable[int]) -> Iterator[None]:
+        """
+        Hold the given stripes' locks, taken in ascending order so concurrent callers can't
+        deadlock.
+        """
+
+        held = []
+        try:
+            for stripe in sorted(stripes):
+                self.locks[stripe].acquire()
+                held.append(stripe)
+            yield
+        finally:
+            for stripe in held:
+                self.locks[stripe].release()
+
+
+# Columnar storage -------------------------------------------------------------------------------
+
+# Row kinds stored in EmployeeColumns.kinds
+HOURLY = 0
+SALARIED = 1
+
+# Role lookup by Role.value, so a uint8 role code converts back without calling Role(value)
+_ROLES_BY_VALUE = {role.value: role for role in Role}
+
+
+class EmployeeView(ABC):
+    """
+    Lightweight, Employee-compatible handle on a single row of an EmployeeColumns store.  Reads
+    and writes go straight through to the underlying columns, so a view never goes stale.
+
+    Instance Attributes:
+        columns (EmployeeColumns): Store the row lives in
+        row (int): Row index in the store
+    """
+
+    __slots__ = ("columns", "row")
+
+    def __init__(self, columns: "EmployeeColumns", row: int) -> None:
+        self.columns = columns
+        self.row = row
+
+    @property
+    def name(self) -> str:
+        """
+        Employee's name.
+        """
+        return self.columns.names[self.row]
+
+    @property
+    def role(self) -> Role:
+        """
+        Employee's role.
+        """
+        return _ROLES_BY_VALUE[self.columns.roles[self.row]]
+
+    @role.setter
+    def role(self, role: Role) -> None:
+        self.columns.roles[self.row] = role.value
+
+    @property
+    def vacation_days(self) -> int:
+        """
+        Employee's remaining vacation days.
+        """
+        return self.columns.vacation_days[self.row]
+
+    @vacation_days.setter
+    def vacation_days(self, days: int) -> None:
+        self.columns.vacation_days[self.row] = days
+
+    @property
+    def period_pay(self) -> float:
+        """
+        Amount paid to the employee for one biweekly pay period.
+        """
+        return self.columns.rates[self.row] * self.columns.hours_worked[self.row]
+
+    # Reuse the dataclass behaviour - it only touches the attributes exposed above
+    take_holiday = Employee.take_holiday
+    payout_holiday = Employee.payout_holiday
+
+    @abstractmethod
+    def materialize(self) -> Employee:
+        """
+        Copy the row out into a regular Employee dataclass instance.
+
+        Returns:
+            Employee: HourlyEmployee or SalariedEmployee holding the row's values
+        """
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EmployeeView):
+            return self.materialize() == other.materialize()
+        return self.materialize() == other
+
+    # Views compare by their mutable row values, like the dataclasses, so they are unhashable
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+
+class HourlyEmployeeView(EmployeeView):
+    """
+    View on a row holding an hourly employee.
+    """
+
+    __slots__ = ()
+
+    @property
+    def hourly_rate(self) -> float:
+        """
+        Employee's hourly rate.
+        """
+        return self.columns.rates[self.row]
+
+    @hourly_rate.setter
+    def hourly_rate(self, rate: float) -> None:
+        self.columns.rates[self.row] = rate
+
+    @property
+    def hours_worked(self) -> int:
+        """
+        Hours worked in the current pay period.
+        """
+        return self.columns.hours_worked[self.row]
+
+    @hours_worked.setter
+    def hours_worked(self, hours: int) -> None:
+        self.columns.hours_worked[self.row] = hours
+
+    pay = HourlyEmployee.pay
+
+    def materialize(self) -> HourlyEmployee:
+        return HourlyEmployee(
+            name=self.name,
+            role=self.role,
+            vacation_days=self.vacation_days,
+            hourly_rate=self.hourly_rate,
+            hours_worked=self.hours_worked,
+        )
+
+
+class SalariedEmployeeView(EmployeeView):
+    """
+    View on a row holding a salaried employee.
+    """
+
+    __slots__ = ()
+
+    @property
+    def biweekly_salary(self) -> float:
+        """
+        Employee's biweekly salary.
+        """
+        return self.columns.rates[self.row]
+
+    @biweekly_salary.setter
+    def biweekly_salary(self, salary: float) -> None:
+        self.columns.rates[self.row] = salary
+
+    pay = SalariedEmployee.pay
+
+    def materialize(self) -> SalariedEmployee:
+        return SalariedEmployee(
+            name=self.name,
+            role=self.role,
+            vacation_days=self.vacation_days,
+            biweekly_salary=self.biweekly_salary,
+        )
+
+
+# Let views pass isinstance checks written against the dataclasses
+HourlyEmployee.register(HourlyEmployeeView)
+SalariedEmployee.register(SalariedEmployeeView)
+
+_VIEW_BY_KIND = {HOURLY: HourlyEmployeeView, SALARIED: SalariedEmployeeView}
+
+
+class EmployeeColumns(Sequence):
+    """
+    Struct-of-arrays employee store.  Each attribute lives in its own column, with numeric
+    attributes packed into typed arrays instead of one Python object per employee.  Indexing or
+    iterating hands out EmployeeView objects, so the store can stand in for a List[Employee].
+
+    Salaried rows store their biweekly salary in the rate column and 1 in the hours column, so
+    rates[i] * hours_worked[i] is the pay for one period on every row.
+
+    Instance Attributes:
+        names (list[str]): Interned employee names
+        roles (array[uint8]): Role.value of each employee
+        kinds (array[uint8]): HOURLY or SALARIED
+        vacation_days (array[int32]): Remaining vacation days
+        rates (array[float64]): Hourly rate or biweekly salary
+        hours_worked (array[int32]): Hours worked this period (1 for salaried rows)
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.roles = array("B")
+        self.kinds = array("B")
+        self.vacation_days = array("i")
+        self.rates = array("d")
+        self.hours_worked = array("i")
+
+    def append(self, employee: Union[Employee, EmployeeView]) -> None:
+        """
+        Copy an employee's values into a new row.
+
+        Args:
+            employee (Employee): Employee (or view) to store
+        """
+
+        self.names.append(sys.intern(employee.name))
+        self.roles.append(employee.role.value)
+        self.vacation_days.append(employee.vacation_days)
+
+        if isinstance(employee, HourlyEmployee):
+            self.kinds.append(HOURLY)
+            self.rates.append(employee.hourly_rate)
+            self.hours_worked.append(employee.hours_worked)
+        else:
+            self.kinds.append(SALARIED)
+            self.rates.append(employee.biweekly_salary)
+            self.hours_worked.append(1)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @overload
+    def __getitem__(self, index: int) -> EmployeeView:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[EmployeeView]:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+
+        row = range(len(self))[index]  # Normalizes negative indices and raises IndexError
+        return _VIEW_BY_KIND[self.kinds[row]](self, row)
+
+    def __iter__(self) -> Iterator[EmployeeView]:
+        for row, kind in enumerate(self.kinds):
+            yield _VIEW_BY_KIND[kind](self, row)
+
+
+class ColumnarCompany(Company):
+    """
+    Company backed by an EmployeeColumns store.  Behaves like Company, but uses a fraction of the
+    memory per employee and answers aggregate reports with scans over packed columns.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.employees: EmployeeColumns = EmployeeColumns()  # type: ignore[assignment]
+
+    def find_employee(self, role: Role) -> List[Employee]:
+        columns = self.employees
+        rows = compress(range(len(columns)), map(role.value.__eq__, columns.roles))
+        return [_VIEW_BY_KIND[columns.kinds[row]](columns, row) for row in rows]
+
+    def headcount_by_role(self) -> Dict[Role, int]:
+        roles = self.employees.roles.tobytes()
+        return {role: roles.count(role.value) for role in Role}
+
+    def total_payroll(self) -> float:
+        return sum(map(mul, self.employees.rates, self.employees.hours_worked))
+
+    def org_payroll(self, manager_id: int) -> float:
+        columns = self.employees
+        rates, hours_worked = columns.rates, columns.hours_worked
+        members = self.org_chart.org(manager_id)
+        return sum(rates[member] * hours_worked[member] for member in members)
+
+    def accrue_vacation(self, days: int = 1) -> None:
+        if days < 0:
+            raise ValueError(f"Expect non-negative days, got {days}")
+
+        balances = self.employees.vacation_days
+        balances[:] = array("i", [balance + days for balance in balances])
+
+    def payout_holidays(self) -> VacationPayoutReport:
+        columns = self.employees
+        balances = columns.vacation_days
+
+        # Days paid per row: clamp each balance into [0, MAX_FIXED_VACATION_DAYS_PAYOUT]
+        limit = MAX_FIXED_VACATION_DAYS_PAYOUT
+        paid = array(
+            "i", [limit if days >= limit else days if days > 0 else 0 for days in balances]
+        )
+        shortage_rows = compress(range(len(columns)), map((1).__gt__, balances))
+
+        report = VacationPayoutReport(
+            employees_paid=len(paid) - paid.count(0),
+            days_paid=sum(paid),
+            shortages=[_VIEW_BY_KIND[columns.kinds[row]](columns, row) for row in shortage_rows],
+        )
+        balances[:] = array(
+            "i", [days - limit if days >= limit else days if days < 1 else 0 for days in balances]
+        )
+
+        return report
+
 
 def main() -> None:
     """
@@ -166,11 +1080,20 @@ def main() -> None:
 
     company = Company()
 
-    company.add_employee(SalariedEmployee(name="Gregg", role=Role.MANAGER))
-    company.add_employee(HourlyEmployee(name="Tom", role=Role.WORKER))
-    company.add_employee(HourlyEmployee(name="Bob", role=Role.INTERN))
-    company.add_employee(SalariedEmployee(name="Craig", role=Role.LEAD))
-    company.add_employee(HourlyEmployee(name="Kristin", role=Role.WORKER))
+    gregg = company.add_employee(SalariedEmployee(name="Gregg", role=Role.MANAGER))
+    tom = company.add_employee(HourlyEmployee(name="Tom", role=Role.WORKER))
+    bob = company.add_employee(HourlyEmployee(name="Bob", role=Role.INTERN))
+    craig = company.add_employee(SalariedEmployee(name="Craig", role=Role.LEAD))
+    kristin = company.add_employee(HourlyEmployee(name="Kristin", role=Role.WORKER))
+
+    company.assign_manager(craig, gregg)
+    company.assign_manager(tom, craig)
+    company.assign_manager(kristin, craig)
+    company.assign_manager(bob, tom)
+
+    print(company.org_headcount(gregg))  # Should be 5 - everyone reports up to Gregg
+    print(company.reports_to(bob, craig))  # Should be True - Bob -> Tom -> Craig
+    print(company.org_payroll(craig))  # Craig's salary plus Tom, Kristin and Bob's pay
 
     print(company.find_employee(role=Role.PRESIDENT))  # Should be an empty list
     print(company.find_employee(role=Role.MANAGER))  # Should contain 1 manager employee
@@ -0,0 +1,322 @@
+"""
+SQLite persistence for the employee management system.
+
+Class(es):
+    EmployeeStore
+
+Function(s):
+    main(None) -> None
+"""
+
+import os
+import sqlite3
+import tempfile
+from typing import Iterator, List, Optional, Tuple, Type
+
+from employee_mgmt import (
+    HOURLY,
+    SALARIED,
+    ColumnarCompany,
+    Company,
+    Employee,
+    HourlyEmployee,
+    Role,
+    SalariedEmployee,
+)
+
+# (kind, name, role, vacation_days, rate, hours_worked) - the same layout as EmployeeColumns
+Row = Tuple[int, str, int, int, float, int]
+
+_ROLES_BY_VALUE = {role.value: role for role in Role}
+_KIND_BY_CLASS = {HourlyEmployee: HOURLY, SalariedEmployee: SALARIED}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    role INTEGER NOT NULL,
+    vacation_days INTEGER NOT NULL,
+    rate REAL NOT NULL,
+    hours_worked INTEGER NOT NULL
+)
+"""
+
+
+def _company_rows(company: Company) -> Iterator[Row]:
+    """
+    Flatten a company's employees into storage rows, in employee order.
+
+    Args:
+        company (Company): Company to flatten
+
+    Returns:
+        Iterator[Row]: One row per employee
+    """
+
+    if isinstance(company, ColumnarCompany):
+        columns = company.employees
+        return zip(
+            columns.kinds,
+            columns.names,
+            columns.roles,
+            columns.vacation_days,
+            columns.rates,
+            columns.hours_worked,
+        )
+
+    return (_employee_row(employee) for employee in company.employees)
+
+
+def _employee_row(employee: Employee) -> Row:
+    """
+    Flatten a single employee into a storage row.
+
+    Args:
+        employee (Employee): Employee to flatten
+
+    Returns:
+        Row: The employee's row
+    """
+
+    if isinstance(employee, HourlyEmployee):
+        rate, hours_worked, kind = employee.hourly_rate, employee.hours_worked, HOURLY
+    else:
+        rate, hours_worked, kind = employee.biweekly_salary, 1, SALARIED
+
+    return (
+        kind,
+        employee.name,
+        employee.role.value,
+        employee.vacation_days,
+        float(rate),
+        hours_worked,
+    )
+
+
+def _row_employee(row: Row) -> Employee:
+    """
+    Build the Employee subclass matching a storage row's kind.
+
+    Args:
+        row (Row): Stored row
+
+    Returns:
+        Employee: HourlyEmployee or SalariedEmployee
+    """
+
+    kind, name, role, vacation_days, rate, hours_worked = row
+    if kind == HOURLY:
+        return HourlyEmployee(
+            name=name,
+            role=_ROLES_BY_VALUE[role],
+            vacation_days=vacation_days,
+            hourly_rate=rate,
+            hours_worked=hours_worked,
+        )
+
+    return SalariedEmployee(
+        name=name,
+        role=_ROLES_BY_VALUE[role],
+        vacation_days=vacation_days,
+        biweekly_salary=rate,
+    )
+
+
+class EmployeeStore:
+    """
+    Save and load a Company to and from an SQLite database.  The store remembers the rows in the
+    database - read when it is opened, then kept up to date by each save and load - so a save
+    only writes employees that were added or changed.
+
+    Instance Attributes:
+        path (str): Database file
+        connection (sqlite3.Connection): Open database connection
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (and if needed create) the database at path.
+
+        Args:
+            path (str): Database file
+        """
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(SCHEMA)
+        # Stored row of each id, at index id - 1; None where there is no row with that id
+        self._saved: List[Optional[Row]] = self._stored_rows()
+
+    def __enter__(self) -> "EmployeeStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+
+        self.connection.close()
+
+    def _stored_rows(self) -> List[Optional[Row]]:
+        """
+        Read every stored row, placed by id.
+
+        Returns:
+            List[Optional[Row]]: Row with id i + 1 at index i, None for ids with no row
+        """
+
+        rows: List[Optional[Row]] = []
+        cursor = self.connection.execute(
+            "SELECT id, kind, name, role, vacation_days, rate, hours_worked FROM employees "
+            "ORDER BY id"
+        )
+        for row_id, *row in cursor:
+            rows.extend([None] * (row_id - 1 - len(rows)))
+            rows.append(tuple(row))  # type: ignore
+
+        return rows
+
+    def save(self, company: Company) -> int:
+        """
+        Write a company's employees to the database, replacing whatever it held, and skipping
+        rows that are already stored unchanged.
+
+        Args:
+            company (Company): Company to save
+
+        Returns:
+            int: Number of rows written
+        """
+
+        saved = self._saved
+        rows: List[Optional[Row]] = list(_company_rows(company))
+        changed = [
+            (index + 1, *row)
+            for index, row in enumerate(rows)
+            if index >= len(saved) or saved[index] != row
+        ]
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO employees VALUES (?, ?, ?, ?, ?, ?, ?)", changed
+            )
+            # Always, not only when this store saved more rows before: another store or process
+            # may have written more since
+            self.connection.execute("DELETE FROM employees WHERE id > ?", (len(rows),))
+
+        # Only once the transaction has committed - after a failed write, a retry must still
+        # find these rows changed
+        self._saved = rows
+
+        return len(changed)
+
+    def iter_employees(
+        self, kind: Optional[Type[Employee]] = None, role: Optional[Role] = None
+    ) -> Iterator[Employee]:
+        """
+        Stream employees out of the database.  Rows are read lazily from the cursor and only
+        turned into their HourlyEmployee/SalariedEmployee objects as they are consumed.
+
+        Args:
+            kind (Type[Employee], optional): Only yield this Employee subclass; Employee itself
+                means every kind. Defaults to None.
+            role (Role, optional): Only yield employees with this role. Defaults to None.
+
+        Raises:
+            ValueError: kind is not Employee, HourlyEmployee or SalariedEmployee
+
+        Returns:
+            Iterator[Employee]: Stored employees, in saved order
+        """
+
+        if kind is not None and kind is not Employee and kind not in _KIND_BY_CLASS:
+            raise ValueError(
+                f"Expect Employee, HourlyEmployee or SalariedEmployee, got {kind.__name__}"
+            )
+
+        clauses, params = [], []
+        if kind is not None and kind is not Employee:
+            clauses.append("kind = ?")
+            params.append(_KIND_BY_CLASS[kind])
+        if role is not None:
+            clauses.append("role = ?")
+            params.append(role.value)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.connection.execute(
+            "SELECT kind, name, role, vacation_days, rate, hours_worked "
+            f"FROM employees{where} ORDER BY id",
+            params,
+        )
+
+        return (_row_employee(row) for row in cursor)
+
+    def load(self, company: Optional[Company] = None) -> Company:
+        """
+        Load every stored employee into a company.
+
+        Args:
+            company (Company, optional): Empty company to fill. Defaults to a new Company.
+
+        Raises:
+            ValueError: company already has employees
+
+        Returns:
+            Company: The filled company
+        """
+
+        if company is None:
+            company = Company()
+        elif len(company.employees):
+            raise ValueError("Expect an empty company to load into")
+
+        stored = self._stored_rows()
+        for row in stored:
+            if row is not None:
+                company.add_employee(_row_employee(row))
+
+        self._saved = stored
+
+        return company
+
+
+def main() -> None:
+    """
+    Module run method.
+    """
+
+    company = Company()
+    company.add_employee(SalariedEmployee(name="Gregg", role=Role.MANAGER))
+    company.add_employee(HourlyEmployee(name="Tom", role=Role.WORKER))
+    company.add_employee(HourlyEmployee(name="Bob", role=Role.INTERN))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "company.db")
+
+        with EmployeeStore(path) as store:
+            print(f"Rows written on first save: {store.save(company)}")
+
+            company.employees[1].take_holiday()
+            print(f"Rows written after one holiday: {store.save(company)}")
+
+        with EmployeeStore(path) as store:
+            loaded = store.load(ColumnarCompany())
+            print(list(loaded.employees))
+            print(list(store.iter_employees(kind=HourlyEmployee)))
+
+        # A new store saving a smaller company removes the rows it no longer has
+        smaller = Company()
+        smaller.add_employee(SalariedEmployee(name="Gregg", role=Role.MANAGER))
+        with EmployeeStore(path) as store:
+            print(f"Rows written saving 1 of 3 employees: {store.save(smaller)}")
+        with EmployeeStore(path) as store:
+            print([employee.name for employee in store.iter_employees(kind=Employee)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Benchmarks comparing the fast-doubling Fibonacci engine with the linear implementations.
+
+Class(es):
+    None
+
+Function(s):
+    time_call(Callable, int) -> Optional[float]
+    benchmark_single_index(list[int]) -> None
+    benchmark_streaming(int, int, bool) -> None
+    stress_test_shared_cache(int, int) -> None
+    benchmark_warm_start(list[int], int) -> None
+    benchmark_growing_calls(int, int) -> None
+    main() -> None
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from iter_fib import Fibonacci, fib
+
+# The decorator examples live in a sibling directory and are written as scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Decorators"))
+
+from fibonacci import iter_fib_num, rec_fib_seq  # type: ignore # pylint: disable=C0413
+
+# Largest n each linear implementation is run for.  The list and @cache based implementations
+# hold every term, which is ~0.35 * n^2 bits - 10^5 terms would already be half a gigabyte.
+LINEAR_LIMITS = {
+    "Fibonacci.__call__": 10**4,
+    "rec_fib_seq": 10**4,
+    "iter_fib_num": 10**5,
+}
+
+
+def time_call(function: Callable[[int], object], n: int) -> Optional[float]:
+    """
+    Time a single call, returning None if the call exceeds the recursion limit.
+
+    Args:
+        function (Callable[[int], object]): Function to time
+        n (int): Argument to call it with
+
+    Returns:
+        Optional[float]: Elapsed seconds
+    """
+
+    start = time.perf_counter()
+    try:
+        function(n)
+    except RecursionError:
+        return None
+    end = time.perf_counter()
+
+    return end - start
+
+
+def benchmark_single_index(sizes: list[int]) -> None:
+    """
+    Time computing F(n) with each implementation for each n in sizes.
+
+    Args:
+        sizes (list[int]): Indices to compute
+    """
+
+    implementations: dict[str, Callable[[int], object]] = {
+        "fib": fib,
+        "Fibonacci.__call__": lambda n: Fibonacci()(n + 1)[n],
+        "rec_fib_seq": rec_fib_seq,
+        "iter_fib_num": iter_fib_num.__wrapped__,  # Skip simple_timer's print
+    }
+
+    for n in sizes:
+        for name, function in implementations.items():
+            if n > LINEAR_LIMITS.get(name, n):
+                continue
+
+            rec_fib_seq.cache_clear()
+            elapsed = time_call(function, n)
+            result = "RecursionError" if elapsed is None else f"{elapsed:.05f} seconds"
+            print(f"{name}({n}): {result}")
+
+        start = time.perf_counter()
+        fib(n, 1_000_000_007)
+        end = time.perf_counter()
+        print(f"fib({n}, mod=1_000_000_007): {end-start:.05f} seconds")
+
+
+def benchmark_streaming(n: int, interval: int, full_cache: bool = True) -> None:
+    """
+    Compare peak memory and time of walking the first n terms with the full per-term cache
+    against streaming them with checkpoints every interval terms, then time a window read.
+
+    Args:
+        n (int): Number of terms to walk
+        interval (int): Checkpoint interval
+        full_cache (bool, optional): Also run the full cache, which needs ~0.35 * n^2 bits of
+            memory. Defaults to True.
+    """
+
+    instances = [(f"Checkpoint every {interval}", Fibonacci(checkpoint_interval=interval))]
+    if full_cache:
+        instances.insert(0, ("Full cache", Fibonacci()))
+
+    for name, fibonacci in instances:
+        tracemalloc.start()
+        start = time.perf_counter()
+        if fibonacci.checkpoint_interval is None:
+            total = sum(term & 1 for term in fibonacci(n))
+        else:
+            total = sum(term & 1 for term in fibonacci.terms(0, n))
+        end = time.perf_counter()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name}: {n} terms ({total} odd) in {end-start:.03f} seconds, "
+            f"peak {peak / 2**20:.1f} MiB"
+        )
+
+        start = time.perf_counter()
+        fibonacci[n // 2 : n // 2 + 100]
+        end = time.perf_counter()
+        print(f"{name}: window fib[{n // 2}:{n // 2 + 100}] in {end-start:.05f} seconds")
+
+
+def stress_test_shared_cache(threads: int, calls: int) -> None:
+    """
+    Call the process-wide Fibonacci instances from many threads at once and check that every
+    result is right and the shared cache was extended exactly once per term.
+
+    Args:
+        threads (int): Number of worker threads
+        calls (int): Calls per thread
+    """
+
+    reference = [0, 1]
+    for _ in range(2, 5_000):
+        reference.append(reference[-2] + reference[-1])
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(calls):
+            n = rng.randrange(2, len(reference))
+            assert Fibonacci.shared()(n)[n - 1] == reference[n - 1]
+            index = rng.randrange(len(reference))
+            assert Fibonacci.shared(checkpoint_interval=100)[index] == reference[index]
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible to provoke races
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(worker, range(threads)))
+        end = time.perf_counter()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    cache = Fibonacci.shared().cache
+    assert cache == reference[: len(cache)], "Shared cache was corrupted"
+    print(
+        f"{threads} threads x {calls} calls on shared instances: {end-start:.03f} seconds, "
+        f"cache intact ({len(cache)} terms)"
+    )
+
+
+def benchmark_warm_start(indices: list[int], interval: int) -> None:
+    """
+    Time looking up windows of terms with a cold checkpoint file against a warm one written by
+    a previous instance.
+
+    Args:
+        indices (list[int]): Start of each 10-term window to look up
+        interval (int): Checkpoint interval
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fib.ckpt")
+
+        for name in ("Cold", "Warm"):
+            start = time.perf_counter()
+            fibonacci = Fibonacci(checkpoint_interval=interval, checkpoint_file=path)
+            for index in indices:
+                fibonacci[index : index + 10]
+            fibonacci.close()
+            end = time.perf_counter()
+            print(f"{name} start, {len(indices)} windows: {end-start:.03f} seconds")
+
+        print(f"Checkpoint file size: {os.path.getsize(path) / 2**20:.1f} MiB")
+
+
+def _original_call(cache: list[int], n: int) -> list[int]:
+    """
+    The original Fibonacci.__call__ algorithm, kept for comparison: it returns the whole cache and
+    re-appends n - 2 terms on every call that reaches past the cache.
+    """
+
+    if n < len(cache):
+        return cache
+
+    for _ in range(2, n):
+        cache.append(cache[-2] + cache[-1])
+
+    return cache
+
+
+def benchmark_growing_calls(step: int, calls: int) -> None:
+    """
+    Time a series of calls asking for ever longer sequences from one instance.
+
+    Args:
+        step (int): Growth in requested length between calls
+        calls (int): Number of calls
+    """
+
+    lengths = [step * (call + 1) for call in range(calls)]
+
+    cache = [0, 1]
+    start = time.perf_counter()
+    for n in lengths:
+        _original_call(cache, n)
+    end = time.perf_counter()
+    print(
+        f"Original __call__, {calls} growing calls: {end-start:.03f} seconds, "
+        f"{len(cache)} cached"
+    )
+
+    fibonacci = Fibonacci()
+    start = time.perf_counter()
+    for n in lengths:
+        fibonacci(n)
+    end = time.perf_counter()
+    print(
+        f"Fibonacci.__call__, {calls} growing calls: {end-start:.03f} seconds, "
+        f"{len(fibonacci.cache)} cached"
+    )
+
+
+def main() -> None:
+    """
+    Module run method.
+    """
+
+    benchmark_single_index([10**3, 10**4, 10**5, 10**6, 10**7])
+    benchmark_streaming(10**5, 1_000)
+    benchmark_streaming(10**6, 10_000, full_cache=False)  # The full cache would need ~40 GiB
+    stress_test_shared_cache(threads=8, calls=200)
+    benchmark_warm_start([10**k + 7 for k in range(3, 8)], 1_000)
+    benchmark_growing_calls(step=1_000, calls=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,232 @@
 Custom module for calculating Fibonacci sequences.
 
 Class(es):
+    CacheView
     Fibonacci
 
 Function(s):
-    None
+    fib(int, Optional[int]) -> int
+    main() -> None
 """
 
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Sequence
+from itertools import islice
+from typing import ClassVar, Iterator, Optional, Union, overload
+
+# Checkpoint file layout: header, then (index, len(a), len(b), a, b) records with a = F(index)
+# and b = F(index + 1) as little-endian unsigned bytes
+CHECKPOINT_MAGIC = b"FIBCKPT1"
+_CHECKPOINT_HEADER = struct.Struct("<8sQ")
+_CHECKPOINT_RECORD = struct.Struct("<QQQ")
+
+
+def _fib_pair(n: int, mod: Optional[int] = None) -> tuple[int, int]:
+    """
+    Calculate the pair (F(n), F(n+1)) by fast doubling, walking the bits of n from the most
+    significant end and using the identities:
+
+        F(2k)   = F(k) * (2 * F(k+1) - F(k))
+        F(2k+1) = F(k)^2 + F(k+1)^2
+
+    Args:
+        n (int): Index of the first term of the pair
+        mod (Optional[int]): Reduce every intermediate value modulo mod. Defaults to None.
+
+    Returns:
+        tuple[int, int]: F(n) and F(n+1)
+    """
+
+    a, b = 0, 1
+
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod is not None:
+            c %= mod
+            d %= mod
+
+        if bit == "1":
+            a, b = d, c + d
+            if mod is not None:
+                b %= mod
+        else:
+            a, b = c, d
+
+    return a, b
+
+
+def fib(n: int, mod: Optional[int] = None) -> int:
+    """
+    Calculate the nth Fibonacci number in O(log n) big-int multiplications, without computing
+    any of the terms before it.
+
+    Args:
+        n (int): Index of the Fibonacci number to be computed
+        mod (Optional[int]): Return F(n) modulo mod, keeping intermediate values small.
+            Defaults to None.
+
+    Raises:
+        ValueError: n must be a non-negative integer and mod a positive integer
+
+    Returns:
+        int: The nth Fibonacci number (modulo mod, if given)
+    """
+
+    # Guard statements
+    if not isinstance(n, int):
+        raise ValueError(f"Integer expected, got {n}")
+    if n < 0:
+        raise ValueError(f"Expect positive integer, got {n}")
+    if mod is not None and (not isinstance(mod, int) or mod < 1):
+        raise ValueError(f"Expect positive integer modulus, got {mod}")
+
+    # Finish the last doubling step by hand - only one of the pair is needed, which saves the
+    # largest multiplication of the whole computation
+    a, b = _fib_pair(n >> 1, mod)
+    value = a * a + b * b if n & 1 else a * (2 * b - a)
+
+    return value if mod is None else value % mod
+
+
+class _CheckpointFile:
+    """
+    Append-only file of Fibonacci checkpoints.  Records already in the file when it is opened are
+    memory-mapped and only decoded when asked for, so opening a large file is a quick scan of the
+    record headers.
+    """
+
+    def __init__(self, path: str, interval: int) -> None:
+        self.path = path
+        self.file = open(path, "a+b")  # pylint: disable=consider-using-with
+        self.map: Optional[mmap.mmap] = None
+        self.offsets: dict[int, tuple[int, int, int]] = {}
+        self.appended: set[int] = set()
+
+        size = os.fstat(self.file.fileno()).st_size
+        if size == 0:
+            self.file.write(_CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, interval))
+            self.file.flush()
+            return
+
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, stored_interval = _CHECKPOINT_HEADER.unpack_from(self.map, 0)
+        if magic != CHECKPOINT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Fibonacci checkpoint file")
+        if stored_interval != interval:
+            self.close()
+            raise ValueError(
+                f"{path} holds checkpoints every {stored_interval} terms, not {interval}"
+            )
+
+        offset = _CHECKPOINT_HEADER.size
+        while offset + _CHECKPOINT_RECORD.size <= size:
+            index, a_length, b_length = _CHECKPOINT_RECORD.unpack_from(self.map, offset)
+            end = offset + _CHECKPOINT_RECORD.size + a_length + b_length
+            if end > size:
+                break
+            self.offsets[index] = (offset + _CHECKPOINT_RECORD.size, a_length, b_length)
+            offset = end
+
+        if offset != size:
+            # Drop a record torn by an interrupted write so new records stay aligned
+            self.map.close()
+            self.file.truncate(offset)
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, index: int) -> Optional[tuple[int, int]]:
+        """
+        Decode the checkpoint at index, if the file holds one.
+        """
+
+        entry = self.offsets.get(index)
+        if entry is None or self.map is None:
+            return None
+
+        start, a_length, b_length = entry
+        middle = start + a_length
+        return (
+            int.from_bytes(self.map[start:middle], "little"),
+            int.from_bytes(self.map[middle : middle + b_length], "little"),
+        )
+
+    def write(self, index: int, pair: tuple[int, int]) -> None:
+        """
+        Append a checkpoint, unless the file already holds it.
+        """
+
+        if index in self.offsets or index in self.appended:
+            return
+
+        a, b = (value.to_bytes((value.bit_length() + 7) // 8, "little") for value in pair)
+        self.file.write(_CHECKPOINT_RECORD.pack(index, len(a), len(b)) + a + b)
+        self.file.flush()
+        self.appended.add(index)
+
+    def close(self) -> None:
+        """
+        Release the memory map and file handle.
+        """
+
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+
+class CacheView(Sequence):
+    """
+    Read-only view of the first length terms of a Fibonacci cache.  The cache only ever grows,
+    so the view stays valid without copying it.
+
+    Instance Attributes:
+        cache (list[int]): Cache being viewed
+        length (int): Number of terms visible through the view
+    """
+
+    def __init__(self, cache: list[int], length: int) -> None:
+        self.cache = cache
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    @overload
+    def __getitem__(self, index: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, list[int]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step < 0:
+                # A stop of -1 here means "before index 0", not the end of the whole cache
+                return [self.cache[i] for i in range(start, stop, step)]
+            return self.cache[start:stop:step]
+
+        if not -self.length <= index < self.length:
+            raise IndexError("CacheView index out of range")
+
+        return self.cache[index % self.length]
+
+    def __iter__(self) -> Iterator[int]:
+        return islice(self.cache, self.length)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or len(other) != self.length:
+            return False
+
+        return all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return repr(self.cache[: self.length])
+
 
 class Fibonacci:
     """
@@ -20,20 +240,99 @@ class Fibonacci:
 
     Instance Attributes:
         cache (list[int]): Stores Fibonacci sequence
+        checkpoint_interval (Optional[int]): If set, keep only every kth pair of terms
+        checkpoints (dict[int, tuple[int, int]]): (F(i), F(i+1)) keyed by i, for i a multiple of
+            checkpoint_interval
+
+    Single terms can be read with fib[n] and windows with fib[start:stop]; terms beyond the cache
+    are computed directly with fast doubling instead of extending the cache up to n.  terms()
+    streams the sequence lazily.
+
+    With a checkpoint_interval of k the instance never grows its cache.  It remembers one pair of
+    terms every k terms instead, so any window is at most k - 1 additions away from a checkpoint
+    and memory use is roughly 1/k of the full cache.  Checkpoints can also be written to a
+    checkpoint_file, which later instances memory-map to start warm.
+
+    Instances are safe to share between threads: the cache and checkpoints are only extended
+    under a lock, so concurrent callers compute each missing term once.  Fibonacci.shared()
+    hands out one process-wide instance per configuration.
     """
 
-    def __init__(self) -> None:
+    _shared: ClassVar[dict[tuple[Optional[int], Optional[str]], "Fibonacci"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self, checkpoint_interval: Optional[int] = None, checkpoint_file: Optional[str] = None
+    ) -> None:
         """
         Initialize instance attributes.
+
+        Args:
+            checkpoint_interval (Optional[int]): Keep a checkpoint every checkpoint_interval terms
+                instead of caching every term. Defaults to None (cache every term).
+            checkpoint_file (Optional[str]): Load checkpoints from, and save new ones to, this
+                file. Requires checkpoint_interval. Defaults to None.
+
+        Raises:
+            ValueError: checkpoint_interval must be a positive integer, and is required for a
+                checkpoint_file
         """
 
+        if checkpoint_interval is not None and (
+            not isinstance(checkpoint_interval, int) or checkpoint_interval < 1
+        ):
+            raise ValueError(f"Expect positive integer, got {checkpoint_interval}")
+        if checkpoint_file is not None and checkpoint_interval is None:
+            raise ValueError("A checkpoint_file needs a checkpoint_interval")
+
         self.cache = [0, 1]
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints: dict[int, tuple[int, int]] = {}
+        self._lock = threading.RLock()
+        self._checkpoint_file = (
+            None
+            if checkpoint_file is None
+            else _CheckpointFile(checkpoint_file, checkpoint_interval)  # type: ignore[arg-type]
+        )
+
+    @classmethod
+    def shared(
+        cls, checkpoint_interval: Optional[int] = None, checkpoint_file: Optional[str] = None
+    ) -> "Fibonacci":
+        """
+        Get the process-wide instance for a configuration, creating it on first use.
+
+        Args:
+            checkpoint_interval (Optional[int]): See Fibonacci(). Defaults to None.
+            checkpoint_file (Optional[str]): See Fibonacci(). Defaults to None.
+
+        Returns:
+            Fibonacci: Instance shared by every caller asking for this configuration
+        """
+
+        key = (checkpoint_interval, checkpoint_file)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(checkpoint_interval, checkpoint_file)
 
-    def __call__(self, n: int) -> list[int]:
+            return cls._shared[key]
+
+    def close(self) -> None:
+        """
+        Close the checkpoint file, if there is one.
+        """
+
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.close()
+            self._checkpoint_file = None
+
+    def __call__(self, n: int) -> Sequence[int]:
         """
         Iteratively calculate a Fibonacci sequence by using the fact that the next number in
         the sequence only relies on the sum of the previous two numbers in the sequence.  An
-        instance of this type is callable.
+        instance of this type is callable.  Only the terms missing from the cache are computed,
+        and the result is a view of the cache rather than a copy.  With a checkpoint_interval
+        set, the sequence is built fresh from terms() and not kept on the instance.
 
         Args:
             n (int): Length of Fibonacci sequence to be computed
@@ -42,7 +341,7 @@ class Fibonacci:
             ValueError: n must be a positive integer
 
         Returns:
-            list: The Fibonacci sequence of a number n
+            Sequence[int]: The first n terms of the Fibonacci sequence
         """
 
         # Guard statements
@@ -50,14 +349,144 @@ class Fibonacci:
             raise ValueError(f"Integer expected, got {n}")
         if n < 0:
             raise ValueError(f"Expect positive integer, got {n}")
-        if n < len(self.cache):
-            return self.cache
+        if self.checkpoint_interval is not None:
+            return list(self.terms(0, n))
+
+        cache = self.cache
+        if n > len(cache):
+            # Re-check the length under the lock - another caller may have extended it already
+            with self._lock:
+                a, b = cache[-2], cache[-1]
+                for _ in range(len(cache), n):
+                    a, b = b, a + b
+                    cache.append(b)
+
+        return CacheView(cache, n)
+
+    @overload
+    def __getitem__(self, index: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, list[int]]:
+        """
+        Look up the Fibonacci number at a single index, or a window of the sequence.  Only the
+        requested terms are computed.
+
+        Args:
+            index (Union[int, slice]): Index of the Fibonacci number, or slice of indices
+
+        Raises:
+            ValueError: indices must be positive integers and a slice must have a stop
+
+        Returns:
+            Union[int, list[int]]: The Fibonacci number at index, or the terms in the slice
+        """
+
+        if isinstance(index, slice):
+            start = 0 if index.start is None else index.start
+            step = 1 if index.step is None else index.step
+            if index.stop is None:
+                raise ValueError("The Fibonacci sequence is infinite, slice needs a stop")
+            if step < 1:
+                raise ValueError(f"Expect positive step, got {step}")
+
+            return list(islice(self.terms(start, max(start, index.stop)), 0, None, step))
+
+        if isinstance(index, int) and 0 <= index < len(self.cache):
+            return self.cache[index]
+        if self.checkpoint_interval is not None:
+            return next(self.terms(index, index + 1))
+
+        return fib(index)
+
+    def terms(self, start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+        """
+        Lazily generate the Fibonacci numbers from index start up to (but excluding) stop.  Only
+        the two most recent terms are held while iterating.
+
+        Args:
+            start (int, optional): Index of the first term. Defaults to 0.
+            stop (Optional[int]): Index to stop at. Defaults to None (never stop).
+
+        Raises:
+            ValueError: start and stop must be positive integers
+
+        Returns:
+            Iterator[int]: Successive Fibonacci numbers
+        """
+
+        # Guard statements
+        for bound in (start, 0 if stop is None else stop):
+            if not isinstance(bound, int):
+                raise ValueError(f"Integer expected, got {bound}")
+            if bound < 0:
+                raise ValueError(f"Expect positive integer, got {bound}")
+
+        return self._terms(start, stop)
+
+    def _terms(self, start: int, stop: Optional[int]) -> Iterator[int]:
+        """
+        Generator behind terms(), split out so the guards run when terms() is called.
+        """
+
+        interval = self.checkpoint_interval
+        a, b = self._pair(start)
+        index = start
+
+        while stop is None or index < stop:
+            yield a
+            a, b = b, a + b
+            index += 1
+            if interval is not None and index % interval == 0 and index not in self.checkpoints:
+                self._add_checkpoint(index, (a, b))
+
+    def _pair(self, index: int) -> tuple[int, int]:
+        """
+        Find (F(index), F(index+1)) from the cache, the nearest checkpoint, or fast doubling.
+        """
+
+        if index + 1 < len(self.cache):
+            return self.cache[index], self.cache[index + 1]
+
+        interval = self.checkpoint_interval
+        if interval is None:
+            return _fib_pair(index)
+
+        base = index - index % interval
+        pair = self.checkpoints.get(base)
+        if pair is None:
+            with self._lock:
+                pair = self.checkpoints.get(base)
+                if pair is None and self._checkpoint_file is not None:
+                    pair = self._checkpoint_file.read(base)
+                    if pair is not None:
+                        self.checkpoints[base] = pair
+                if pair is None:
+                    pair = _fib_pair(base)
+                    self._add_checkpoint(base, pair)
+
+        a, b = pair
+        for _ in range(index - base):
+            a, b = b, a + b
+
+        return a, b
+
+    def _add_checkpoint(self, index: int, pair: tuple[int, int]) -> None:
+        """
+        Record a checkpoint in memory and, if configured, in the checkpoint file.
+        """
 
-        for _ in range(2, n):
-            fib_num = self.cache[-2] + self.cache[-1]
-            self.cache.append(fib_num)
+        with self._lock:
+            if index in self.checkpoints:
+                return
 
-        return self.cache
+            self.checkpoints[index] = pair
+            if self._checkpoint_file is not None:
+                self._checkpoint_file.write(index, pair)
 
     def __repr__(self) -> str:
         return "fib = Fibonacci()\nfib(n)"
@@ -1,5 +1,6 @@
 """
-Main module to instatiate a point-of-sale system.
+Main module to instatiate a point-of-sale system.  Run it with the Decorators examples on the
+path, e.g. `PYTHONPATH=../../Decorators python main.py`.
 
 Class(es):
     None
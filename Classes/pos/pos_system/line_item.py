@@ -1,5 +1,6 @@
 """
-Module for representing the LineItems of an Order.
+Module for representing the LineItems of an Order.  Uses cached_property from the Decorators
+examples, which must be on the path.
 
 Class(es):
     LineItem
@@ -9,6 +10,8 @@ Function(s):
 """
 from dataclasses import dataclass
 
+from cached_property import cached_property  # type: ignore
+
 
 @dataclass
 class LineItem:
@@ -20,10 +23,10 @@ class LineItem:
     quantity: int
     price: int
 
-    @property
+    @cached_property("quantity", "price")
     def total_price(self) -> int:
         """
-        Calculate total price for a line item.
+        Calculate total price for a line item, cached until the quantity or price changes.
 
         Returns:
             int: Total price of line item
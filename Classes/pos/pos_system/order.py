@@ -64,7 +64,10 @@ class Order:
     @property
     def total_price(self) -> int:
         """
-        Calculate total price of an order.
+        Calculate total price of an order.  Deliberately not a cached_property: it depends on
+        the line items' own fields and on items changing in place, neither of which assigns an
+        attribute of the order, so a cached total would go stale.  Each line item caches its
+        own total instead.
 
         Returns:
             int: Total price
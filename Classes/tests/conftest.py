@@ -0,0 +1,9 @@
+"""
+Pytest configuration for the Classes examples, which are written as scripts importing their
+siblings by module name.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
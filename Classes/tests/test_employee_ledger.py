@@ -0,0 +1,148 @@
+"""
+Concurrency tests for VacationLedger.  Seeded worker threads hammer a small pool of employees
+with holiday requests, batches and bulk accruals, and the balances left behind are checked
+against what each thread was granted.
+
+Class(es):
+    None
+
+Function(s):
+    run_workers(Callable[[int], list[int]], int) -> list[list[int]]
+    test_requests_never_overdraw(type, str) -> None
+    test_bulk_operations_hold_every_stripe(type) -> None
+    test_rejected_requests_change_nothing(int) -> None
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pytest
+
+from employee_benchmarks import build_company
+from employee_mgmt import ColumnarCompany, Company, VacationDaysShortageError, VacationLedger
+
+THREADS = 8
+EMPLOYEES = 50
+
+
+def run_workers(worker: Callable[[int], list[int]], threads: int = THREADS) -> list[list[int]]:
+    """
+    Run a worker on several threads, each seeded with its index.
+
+    Args:
+        worker (Callable[[int], list[int]]): Function of a seed returning days granted per
+            employee
+        threads (int, optional): Threads to run. Defaults to THREADS.
+
+    Returns:
+        list[list[int]]: Each thread's result
+    """
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(worker, range(threads)))
+
+
+@pytest.mark.parametrize("mode", ["single", "batch"])
+@pytest.mark.parametrize("company_type", [Company, ColumnarCompany])
+def test_requests_never_overdraw(company_type: type, mode: str) -> None:
+    """
+    No balance goes negative, and every granted day is deducted exactly once.
+    """
+
+    company = build_company(company_type(), EMPLOYEES)
+    initial = [employee.vacation_days for employee in company.employees]
+    ledger = VacationLedger(company, stripes=8)
+
+    def worker(seed: int) -> list[int]:
+        rng = random.Random(seed)
+        granted = [0] * EMPLOYEES
+        for _ in range(2_000):
+            if mode == "single":
+                employee_id, days = rng.randrange(EMPLOYEES), rng.randint(1, 3)
+                try:
+                    ledger.take_holiday(employee_id, days)
+                    granted[employee_id] += days
+                except VacationDaysShortageError:
+                    pass
+            else:
+                batch = {rng.randrange(EMPLOYEES): -rng.randint(1, 3) for _ in range(5)}
+                try:
+                    ledger.commit(batch)
+                    for employee_id, change in batch.items():
+                        granted[employee_id] -= change
+                except VacationDaysShortageError:
+                    pass
+        return granted
+
+    results = run_workers(worker)
+
+    for employee_id, employee in enumerate(company.employees):
+        granted = sum(result[employee_id] for result in results)
+        assert employee.vacation_days >= 0
+        assert employee.vacation_days == initial[employee_id] - granted
+        assert ledger.balance(employee_id) == employee.vacation_days
+
+
+@pytest.mark.parametrize("company_type", [Company, ColumnarCompany])
+def test_bulk_operations_hold_every_stripe(company_type: type) -> None:
+    """
+    Accruals through the ledger running alongside holiday requests lose no update.
+    """
+
+    company = build_company(company_type(), EMPLOYEES)
+    initial = [employee.vacation_days for employee in company.employees]
+    ledger = VacationLedger(company, stripes=8)
+    accruals = 200
+
+    def worker(seed: int) -> list[int]:
+        granted = [0] * EMPLOYEES
+        if seed == 0:
+            for _ in range(accruals):
+                ledger.accrue_vacation(1)
+            return granted
+
+        rng = random.Random(seed)
+        for _ in range(2_000):
+            employee_id = rng.randrange(EMPLOYEES)
+            try:
+                ledger.take_holiday(employee_id)
+                granted[employee_id] += 1
+            except VacationDaysShortageError:
+                pass
+        return granted
+
+    results = run_workers(worker)
+
+    for employee_id, employee in enumerate(company.employees):
+        granted = sum(result[employee_id] for result in results)
+        assert employee.vacation_days == initial[employee_id] + accruals - granted
+
+    report = ledger.payout_holidays()
+    assert report.employees_paid + len(report.shortages) == EMPLOYEES
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_rejected_requests_change_nothing(seed: int) -> None:
+    """
+    Requests for too many days, and for no or negative days, leave every balance untouched.
+    """
+
+    rng = random.Random(seed)
+    company = build_company(ColumnarCompany(), EMPLOYEES, seed=seed)
+    ledger = VacationLedger(company)
+    balances = [employee.vacation_days for employee in company.employees]
+
+    for _ in range(100):
+        employee_id = rng.randrange(EMPLOYEES)
+        with pytest.raises(VacationDaysShortageError):
+            ledger.take_holiday(employee_id, balances[employee_id] + rng.randint(1, 5))
+        with pytest.raises(ValueError):
+            ledger.take_holiday(employee_id, -rng.randint(0, 10))
+
+        batch = {other: -1 for other in rng.sample(range(EMPLOYEES), 5)}
+        batch[employee_id] = -balances[employee_id] - 1
+        with pytest.raises(VacationDaysShortageError):
+            ledger.commit(batch)
+
+    assert [employee.vacation_days for employee in company.employees] == balances
@@ -0,0 +1,263 @@
+"""
+Property-based tests for the company models in employee_mgmt: ColumnarCompany against the
+object-per-employee Company, the bulk vacation operations against the per-employee ones, and
+OrgChart against a plain manager list.  Each test is driven by a seeded random generator, so
+failures are reproducible from the seed.
+
+Class(es):
+    None
+
+Function(s):
+    has_cycle(list[int]) -> bool
+    reference_org(list[int], int) -> set[int]
+    test_columnar_matches_company(int) -> None
+    test_views_behave_like_employees(int) -> None
+    test_bulk_vacation_matches_per_employee(int) -> None
+    test_org_chart_matches_reference(int, int) -> None
+    test_org_chart_rejects_cycles(int) -> None
+"""
+
+import io
+import random
+from contextlib import redirect_stdout
+
+import pytest
+
+import employee_mgmt
+from employee_benchmarks import build_company, build_org_chart
+from employee_mgmt import (
+    ColumnarCompany,
+    Company,
+    EmployeeView,
+    HourlyEmployee,
+    Role,
+    VacationDaysShortageError,
+)
+
+SEEDS = range(10)
+
+
+def has_cycle(managers: list[int]) -> bool:
+    """
+    Whether following managers up from some employee never reaches the top.
+
+    Args:
+        managers (list[int]): Direct manager of each employee, -1 for none
+
+    Returns:
+        bool: True if the reporting lines contain a cycle
+    """
+
+    for employee_id in range(len(managers)):
+        node = employee_id
+        for _ in range(len(managers)):
+            node = managers[node]
+            if node == -1:
+                break
+        else:
+            return True
+
+    return False
+
+
+def reference_org(managers: list[int], manager_id: int) -> set[int]:
+    """
+    A manager and everyone reporting up to them, found by walking each employee's chain of
+    managers.
+
+    Args:
+        managers (list[int]): Direct manager of each employee, -1 for none
+        manager_id (int): Manager whose org is requested
+
+    Returns:
+        set[int]: Employee ids in the org, including the manager
+    """
+
+    members = set()
+    for employee_id in range(len(managers)):
+        node = employee_id
+        while node != -1 and node != manager_id:
+            node = managers[node]
+        if node == manager_id:
+            members.add(employee_id)
+
+    return members
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_columnar_matches_company(seed: int) -> None:
+    """
+    The same employees give the same answers whether stored as objects or in columns.
+    """
+
+    n = 500
+    company = build_company(Company(), n, seed=seed)
+    columnar = build_company(ColumnarCompany(), n, seed=seed)
+    build_org_chart(company, seed=seed)
+    build_org_chart(columnar, seed=seed)
+
+    assert list(columnar.employees) == company.employees
+    assert columnar.headcount_by_role() == company.headcount_by_role()
+    assert columnar.total_payroll() == pytest.approx(company.total_payroll())
+    for role in Role:
+        assert columnar.find_employee(role) == company.find_employee(role)
+
+    rng = random.Random(seed)
+    for manager_id in rng.sample(range(n), 20):
+        assert columnar.org_payroll(manager_id) == pytest.approx(company.org_payroll(manager_id))
+        assert columnar.org_members(manager_id) == company.org_members(manager_id)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_views_behave_like_employees(seed: int) -> None:
+    """
+    Writes through a view land in the columns, and views pass for the dataclasses they mirror.
+    """
+
+    rng = random.Random(seed)
+    columnar = build_company(ColumnarCompany(), 50, seed=seed)
+    company = build_company(Company(), 50, seed=seed)
+
+    for _ in range(100):
+        employee_id = rng.randrange(50)
+        view, employee = columnar.employees[employee_id], company.employees[employee_id]
+        assert isinstance(view, EmployeeView)
+        assert isinstance(view, type(employee))
+        assert view.period_pay == employee.period_pay
+
+        days = rng.randint(0, 30)
+        view.vacation_days = employee.vacation_days = days
+        assert columnar.employees.vacation_days[employee_id] == days
+        assert view.materialize() == employee
+
+    with pytest.raises(TypeError):
+        hash(columnar.employees[0])
+    with pytest.raises(TypeError):
+        EmployeeView(columnar.employees, 0)  # type: ignore[abstract]  # pylint: disable=E0110
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bulk_vacation_matches_per_employee(seed: int) -> None:
+    """
+    accrue_vacation and payout_holidays leave the same balances as accruing and paying out one
+    employee at a time, and report every employee with nothing to pay out.
+    """
+
+    n = 300
+    expected = build_company(Company(), n, seed=seed)
+    shortages = []
+    with redirect_stdout(io.StringIO()):
+        for employee in expected.employees:
+            employee.vacation_days += 1
+            try:
+                employee.payout_holiday()
+            except VacationDaysShortageError:
+                shortages.append(employee)
+    balances = [employee.vacation_days for employee in expected.employees]
+
+    for company_type in (Company, ColumnarCompany):
+        company = build_company(company_type(), n, seed=seed)
+        company.accrue_vacation(1)
+        report = company.payout_holidays()
+
+        assert [employee.vacation_days for employee in company.employees] == balances
+        assert report.shortages == shortages
+        assert report.employees_paid == n - len(shortages)
+
+        with pytest.raises(ValueError):
+            company.accrue_vacation(-1)
+
+
+@pytest.mark.parametrize("spacing", [employee_mgmt.TOUR_LABEL_SPACING, 2])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_org_chart_matches_reference(
+    seed: int, spacing: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    After any sequence of hires and single or bulk reassignments, reporting queries agree with a
+    plain manager list.  With a label spacing of 2 almost every reassignment has to relabel
+    around the moved block.
+    """
+
+    monkeypatch.setattr(employee_mgmt, "TOUR_LABEL_SPACING", spacing)
+    rng = random.Random(seed)
+    company = Company()
+    managers: list[int] = []
+
+    for step in range(300):
+        if not managers or rng.random() < 0.3:
+            company.add_employee(HourlyEmployee(name=f"e{step}", role=Role.WORKER))
+            managers.append(-1)
+        elif rng.random() < 0.05:
+            assignments = {
+                employee_id: rng.randrange(employee_id) if employee_id else None
+                for employee_id in rng.sample(range(len(managers)), len(managers) // 2)
+            }
+            updated = list(managers)
+            for employee_id, manager_id in assignments.items():
+                updated[employee_id] = -1 if manager_id is None else manager_id
+            # Employees moved under later hires before can close a cycle
+            if has_cycle(updated):
+                with pytest.raises(ValueError):
+                    company.assign_managers(assignments)
+            else:
+                company.assign_managers(assignments)
+                managers = updated
+        else:
+            employee_id = rng.randrange(len(managers))
+            manager_id = rng.choice([None, rng.randrange(len(managers))])
+            if manager_id is not None and manager_id in reference_org(managers, employee_id):
+                continue
+            company.assign_manager(employee_id, manager_id)
+            managers[employee_id] = -1 if manager_id is None else manager_id
+
+        chart = company.org_chart
+        assert list(chart.managers) == managers
+
+        for manager_id in rng.sample(range(len(managers)), min(5, len(managers))):
+            org = reference_org(managers, manager_id)
+            members = chart.org(manager_id)
+            assert members[0] == manager_id
+            assert sorted(members) == sorted(org)
+            assert company.org_headcount(manager_id) == len(org)
+            for employee_id in range(len(managers)):
+                expected = employee_id in org and employee_id != manager_id
+                assert company.reports_to(employee_id, manager_id) == expected
+
+    # The tour visits everyone once, in strictly increasing label order
+    chart = company.org_chart
+    node, labels = chart._head, []  # pylint: disable=W0212
+    while node != -1:
+        labels.append(chart.labels[node])
+        node = chart.following[node]
+    assert len(labels) == len(managers)
+    assert all(a < b for a, b in zip(labels, labels[1:]))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_org_chart_rejects_cycles(seed: int) -> None:
+    """
+    Reassignments that would make someone report to themselves are refused and change nothing.
+    """
+
+    rng = random.Random(seed)
+    company = build_company(Company(), 100, seed=seed)
+    build_org_chart(company, seed=seed)
+    managers = list(company.org_chart.managers)
+
+    for _ in range(20):
+        manager_id = rng.randrange(1, 100)
+        chain = company.org_chart.chain_of_command(manager_id)
+        if not chain:
+            continue
+        with pytest.raises(ValueError):
+            company.assign_manager(rng.choice(chain), manager_id)
+        with pytest.raises(ValueError):
+            company.assign_managers({rng.choice(chain): manager_id})
+
+        assert list(company.org_chart.managers) == managers
+        assert sorted(company.org_chart.org(0)) == sorted(reference_org(managers, 0))
+
+    with pytest.raises(ValueError):
+        company.assign_manager(0, 0)
+
@@ -0,0 +1,154 @@
+"""
+Property-based tests for employee_store.  Companies are changed in seeded random ways and saved,
+and what the database holds is checked against the company after every save, so failures are
+reproducible from the seed.
+
+Class(es):
+    None
+
+Function(s):
+    mutate(Company, random.Random) -> None
+    test_round_trip(int, type) -> None
+    test_incremental_saves_match_company(int) -> None
+    test_failed_save_is_retried(int) -> None
+    test_iter_employees_filters(int) -> None
+"""
+
+import random
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from employee_benchmarks import build_company
+from employee_mgmt import (
+    ColumnarCompany,
+    Company,
+    Employee,
+    HourlyEmployee,
+    Role,
+    SalariedEmployee,
+)
+from employee_store import EmployeeStore
+
+SEEDS = range(10)
+
+
+def mutate(company: Company, rng: random.Random) -> None:
+    """
+    Change a few random balances and roles, and sometimes hire someone.
+
+    Args:
+        company (Company): Company to change
+        rng (random.Random): Source of the changes
+    """
+
+    for _ in range(rng.randint(0, 5)):
+        employee = company.employees[rng.randrange(len(company.employees))]
+        employee.vacation_days = rng.randint(0, 30)
+        employee.role = rng.choice(list(Role))
+    if rng.random() < 0.3:
+        company.add_employee(HourlyEmployee(name="New", role=Role.INTERN))
+
+
+@pytest.mark.parametrize("company_type", [Company, ColumnarCompany])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_round_trip(seed: int, company_type: type, tmp_path: Path) -> None:
+    """
+    Loading a saved company gives back the same employees, into either company type.
+    """
+
+    company = build_company(company_type(), 200, seed=seed)
+    with EmployeeStore(str(tmp_path / "company.db")) as store:
+        assert store.save(company) == 200
+        assert store.save(company) == 0
+
+        for load_type in (Company, ColumnarCompany):
+            loaded = store.load(load_type())
+            assert list(loaded.employees) == list(company.employees)
+
+        with pytest.raises(ValueError):
+            store.load(company)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_incremental_saves_match_company(seed: int, tmp_path: Path) -> None:
+    """
+    Saves write only changed rows, and after every save - including from a second store on the
+    same database, and of a smaller company - the database holds exactly the company.
+    """
+
+    rng = random.Random(seed)
+    path = str(tmp_path / "company.db")
+    company = build_company(Company(), 50, seed=seed)
+
+    with EmployeeStore(path) as store:
+        store.save(company)
+        for _ in range(20):
+            before = [tuple(vars(employee).values()) for employee in company.employees]
+            mutate(company, rng)
+            after = [tuple(vars(employee).values()) for employee in company.employees]
+            changed = sum(
+                index >= len(before) or before[index] != row for index, row in enumerate(after)
+            )
+
+            assert store.save(company) == changed
+            assert list(store.iter_employees()) == company.employees
+
+    smaller = build_company(Company(), rng.randint(1, 10), seed=seed + 1)
+    with EmployeeStore(path) as store:
+        store.save(smaller)
+        assert list(store.iter_employees()) == smaller.employees
+    with EmployeeStore(path) as store:
+        assert list(store.load().employees) == smaller.employees
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_failed_save_is_retried(seed: int, tmp_path: Path) -> None:
+    """
+    Rows from a save that failed to commit are written by the next save, not taken as saved.
+    """
+
+    rng = random.Random(seed)
+    path = str(tmp_path / "company.db")
+    company = build_company(Company(), 20, seed=seed)
+
+    with EmployeeStore(path) as store:
+        store.save(company)
+        store.connection.execute("PRAGMA busy_timeout = 0")
+        mutate(company, rng)
+        company.employees[0].vacation_days += 1
+
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN EXCLUSIVE")
+        with pytest.raises(sqlite3.OperationalError):
+            store.save(company)
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+        assert store.save(company) >= 1
+        assert list(store.iter_employees()) == company.employees
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_iter_employees_filters(seed: int, tmp_path: Path) -> None:
+    """
+    Filtering by kind and role streams the same employees as filtering the company.
+    """
+
+    company = build_company(ColumnarCompany(), 100, seed=seed)
+    with EmployeeStore(str(tmp_path / "company.db")) as store:
+        store.save(company)
+
+        for kind in (None, Employee, HourlyEmployee, SalariedEmployee):
+            for role in (None, *Role):
+                expected = [
+                    employee
+                    for employee in company.employees
+                    if (kind is None or isinstance(employee, kind))
+                    and (role is None or employee.role == role)
+                ]
+                assert list(store.iter_employees(kind=kind, role=role)) == expected
+
+        with pytest.raises(ValueError):
+            store.iter_employees(kind=int)  # type: ignore[arg-type]
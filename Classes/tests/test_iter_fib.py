@@ -0,0 +1,155 @@
+"""
+Property-based tests for iter_fib.  Each test drives Fibonacci through a seeded random sequence
+of calls and checks every result against a plainly computed reference list, so failures are
+reproducible from the seed.
+
+Class(es):
+    None
+
+Function(s):
+    reference(int) -> list[int]
+    test_call_matches_reference(int) -> None
+    test_view_len_and_indexing(int) -> None
+    test_cache_holds_each_term_once(int) -> None
+    test_shared_instance_across_threads() -> None
+"""
+
+import random
+import threading
+from collections.abc import Sequence
+
+import pytest
+
+from iter_fib import CacheView, Fibonacci
+
+SEEDS = range(20)
+
+# Largest sequence length drawn; calls shrink and grow the request anywhere below it
+MAX_LENGTH = 300
+
+
+def reference(n: int) -> list[int]:
+    """
+    The first n Fibonacci numbers, computed without any caching.
+
+    Args:
+        n (int): Number of terms
+
+    Returns:
+        list[int]: F(0) to F(n - 1)
+    """
+
+    terms = []
+    a, b = 0, 1
+    for _ in range(n):
+        terms.append(a)
+        a, b = b, a + b
+
+    return terms
+
+
+REFERENCE = reference(MAX_LENGTH)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_call_matches_reference(seed: int) -> None:
+    """
+    Growing and shrinking calls each return exactly the first n terms, and earlier views stay
+    correct after later calls extend the cache.
+    """
+
+    rng = random.Random(seed)
+    fib = Fibonacci()
+    views = []
+
+    for _ in range(50):
+        n = rng.randrange(MAX_LENGTH)
+        view = fib(n)
+        assert list(view) == REFERENCE[:n]
+        assert view == REFERENCE[:n]
+        views.append((n, view))
+
+    for n, view in views:
+        assert list(view) == REFERENCE[:n]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_view_len_and_indexing(seed: int) -> None:
+    """
+    A view behaves like the list of its terms for len, positive and negative indices, slices and
+    out-of-range indices, even when the cache behind it is longer.
+    """
+
+    rng = random.Random(seed)
+    fib = Fibonacci()
+    fib(MAX_LENGTH)  # The cache is now longer than every view taken below
+
+    for _ in range(50):
+        n = rng.randrange(MAX_LENGTH)
+        view = fib(n)
+        expected = REFERENCE[:n]
+
+        assert isinstance(view, CacheView) and isinstance(view, Sequence)
+        assert len(view) == n
+        assert repr(view) == repr(expected)
+
+        for _ in range(10):
+            index = rng.randrange(-n - 3, n + 3)
+            if -n <= index < n:
+                assert view[index] == expected[index]
+            else:
+                with pytest.raises(IndexError):
+                    view[index]  # pylint: disable=pointless-statement
+
+            start, stop = rng.randrange(-n - 3, n + 3), rng.randrange(-n - 3, n + 3)
+            step = rng.choice([None, 1, 2, 3, -1, -2])
+            assert view[start:stop:step] == expected[start:stop:step]
+
+        assert view != REFERENCE[: n + 1]
+        assert view != expected + [0]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_cache_holds_each_term_once(seed: int) -> None:
+    """
+    After any sequence of calls and lookups the cache is a prefix of the sequence: no wrong,
+    duplicated or skipped terms, and no longer than the largest call needed.
+    """
+
+    rng = random.Random(seed)
+    fib = Fibonacci()
+    longest = 2  # The cache starts as [0, 1]
+
+    for _ in range(50):
+        if rng.random() < 0.7:
+            n = rng.randrange(MAX_LENGTH)
+            fib(n)
+            longest = max(longest, n)
+        else:
+            index = rng.randrange(2 * MAX_LENGTH)
+            assert fib[index] == reference(index + 1)[index]
+
+        assert fib.cache == REFERENCE[:longest]
+
+
+def test_shared_instance_across_threads() -> None:
+    """
+    Threads extending one instance concurrently still leave a single correct copy of each term.
+    """
+
+    fib = Fibonacci()
+    lengths = [random.Random(seed).randrange(MAX_LENGTH) for seed in SEEDS]
+    errors = []
+
+    def worker(n: int) -> None:
+        if list(fib(n)) != REFERENCE[:n]:
+            errors.append(n)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in lengths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert fib.cache == REFERENCE[: max(2, *lengths)]
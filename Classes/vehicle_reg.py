@@ -1,5 +1,6 @@
 """
-Example vehicle registration system.
+Example vehicle registration system.  Uses cached_property from the Decorators examples, so run
+it with that directory on the path, e.g. `PYTHONPATH=../Decorators python vehicle_reg.py`.
 """
 
 import random
@@ -9,6 +10,8 @@ from datetime import datetime
 from enum import Enum, auto
 from typing import Optional, Tuple
 
+from cached_property import cached_property  # type: ignore
+
 
 class FuelType(Enum):
     """
@@ -58,10 +61,11 @@ class VehicleModelInfo:
         FuelType.ELECTRIC
     )  # Optimistically assume vehicles are electric by default
 
-    @property
+    @cached_property("catalogue_price", "fuel_type")
     def tax(self) -> float:
         """
-        Vehicle tax to paid when registering a vehicle of this type.
+        Vehicle tax to paid when registering a vehicle of this type.  Cached until the price or
+        fuel type changes.
 
         Returns:
             float: Registration tax amount
@@ -0,0 +1,243 @@
+"""
+Custom module for a non-blocking logging decorator, a replacement for my_logger on hot functions.
+The calling thread only builds a log record and puts it on a queue; a background QueueListener
+thread formats the arguments and writes the record out.  Calls can be sampled and rate limited,
+and arguments are never repr'd for calls that aren't logged.
+
+Class(es):
+    None
+
+Function(s):
+    async_logger(function, int, Optional[float], int, Optional[logging.Handler]) -> function
+    flush_logs() -> None
+    main() -> None
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import threading
+import time
+from functools import wraps
+from threading import get_ident
+from typing import Optional
+
+from decorators import my_logger
+
+# Records from every decorated function, waiting for the listener thread
+_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+
+# Output handler of each decorated function, by logger name
+_HANDLERS: dict[str, logging.Handler] = {}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _CallListener(logging.handlers.QueueListener):
+    """
+    Listener turning queued calls into log records and passing each on to its decorated
+    function's own handler.  Calls are queued as plain tuples so that even building the
+    LogRecord happens on the listener thread.
+    """
+
+    def prepare(self, record: tuple) -> logging.LogRecord:
+        name, level, code, message, args, created, thread = record
+        log_record = logging.LogRecord(
+            name, level, code.co_filename, code.co_firstlineno, message, args, None, code.co_name
+        )
+        log_record.created = created
+        log_record.msecs = created % 1 * 1000
+        log_record.relativeCreated = (created - logging._startTime) * 1000  # pylint: disable=W0212
+        log_record.thread = thread
+        log_record.threadName = None
+
+        return log_record
+
+    def handle(self, record: tuple) -> None:
+        log_record = self.prepare(record)
+        _HANDLERS[log_record.name].handle(log_record)
+
+
+def _start_listener() -> None:
+    """
+    Start the listener thread, if it isn't running already.
+    """
+
+    global _listener  # pylint: disable=W0603
+
+    with _listener_lock:
+        if _listener is None:
+            _listener = _CallListener(_QUEUE)
+            _listener.start()
+
+
+def flush_logs() -> None:
+    """
+    Write out every queued record and stop the listener thread.  It restarts on the next call of
+    a decorated function.  Runs automatically at exit.
+    """
+
+    global _listener  # pylint: disable=W0603
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+    for handler in _HANDLERS.values():
+        handler.flush()
+
+
+atexit.register(flush_logs)
+
+
+def async_logger(
+    function=None,
+    every: int = 1,
+    max_per_second: Optional[float] = None,
+    level: int = logging.INFO,
+    handler: Optional[logging.Handler] = None,
+):
+    """
+    Decorator that logs each call's arguments without blocking the caller.  Can be used bare
+    (@async_logger) or with arguments (@async_logger(every=100, max_per_second=50)).
+
+    Records go to a logger named after the function's module and qualified name, set to level
+    unless it already has a level of its own, so logging doesn't depend on the root logger's
+    configuration; raise the logger's level to switch it off.  They are written by handler - by
+    default, like my_logger, the file <function name>.log.  Arguments are repr'd on the listener
+    thread: a mutable argument changed straight after the call may be logged in its new state.
+
+    Args:
+        function (function): Function to be logged
+        every (int, optional): Log one call in every. Defaults to 1.
+        max_per_second (Optional[float], optional): Log at most this many calls a second, with
+            bursts of up to that many. Defaults to None.
+        level (int, optional): Level of the records. Defaults to logging.INFO.
+        handler (Optional[logging.Handler], optional): Handler writing the records. Defaults to
+            None.
+    """
+
+    if function is None:
+        return lambda function: async_logger(function, every, max_per_second, level, handler)
+
+    name = f"{function.__module__}.{function.__qualname__}"
+    logger = logging.getLogger(name)
+    if logger.level == logging.NOTSET:
+        # Otherwise the level is inherited from the root logger, WARNING unless configured
+        logger.setLevel(level)
+    if handler is None:
+        handler = logging.FileHandler(f"{function.__name__}.log", delay=True)
+    _HANDLERS[name] = handler
+
+    code = function.__code__
+    put = _QUEUE.put_nowait
+    countdown = every
+    tokens = max_per_second
+    refilled = time.monotonic()
+    not_logged = 0
+
+    @wraps(function)
+    def wrapper_func(*args, **kwargs):
+        nonlocal countdown, tokens, refilled, not_logged
+
+        countdown -= 1
+        if countdown:
+            not_logged += 1
+            return function(*args, **kwargs)
+        countdown = every
+
+        if tokens is not None:
+            # Token bucket: refill at max_per_second, spend one per record
+            now = time.monotonic()
+            tokens = min(max_per_second, tokens + (now - refilled) * max_per_second)
+            refilled = now
+            if tokens < 1:
+                not_logged += 1
+                return function(*args, **kwargs)
+            tokens -= 1
+
+        if logger.isEnabledFor(level):
+            if _listener is None:
+                _start_listener()
+
+            # Queue just the call: Logger.info would walk the stack to find the caller, and
+            # QueueHandler would format the message here rather than on the listener
+            if not_logged:
+                message, message_args = (
+                    "Ran with args: %s and kwargs: %s (%d calls not logged)",
+                    (args, kwargs, not_logged),
+                )
+                not_logged = 0
+            else:
+                message, message_args = "Ran with args: %s and kwargs: %s", (args, kwargs)
+            put((name, level, code, message, message_args, time.time(), get_ident()))
+
+        return function(*args, **kwargs)
+
+    return wrapper_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    calls = 100_000
+    payload = {"user": "Bill", "items": list(range(20))}
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+
+        # Logs with the default logging setup, before my_logger calls basicConfig(level=INFO)
+        @async_logger
+        def greet(name: str) -> str:
+            return f"Hello {name}"
+
+        assert logging.getLogger().level == logging.WARNING and not logging.getLogger().handlers
+        greet("Bill")
+        flush_logs()
+        with open("greet.log", encoding="utf-8") as file:
+            assert "Ran with args: ('Bill',)" in file.read()
+        print("async_logger logs without basicConfig")
+
+        def handle(request: dict) -> int:
+            return len(request)
+
+        variants = {
+            "my_logger": my_logger(handle),
+            "async_logger": async_logger(handle),
+            "async_logger(every=100)": async_logger(every=100)(handle),
+            "async_logger(max_per_second=1000)": async_logger(max_per_second=1000)(handle),
+        }
+
+        for name, function in variants.items():
+            start = time.perf_counter()
+            for _ in range(calls):
+                function(payload)
+            end = time.perf_counter()
+            print(f"{name}: {(end - start) / calls * 1e9:.0f} ns per call")
+
+            start = time.perf_counter()
+            flush_logs()
+            end = time.perf_counter()
+            print(f"{name}: {end - start:.03f} seconds to drain the queue")
+
+        for handler in _HANDLERS.values():
+            handler.close()
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Custom module for decorators that coalesce single-item calls into batch calls.  The decorated
+function takes a list of items and returns a list of results, one per item; callers call the
+decorated function with one item at a time, and calls arriving together are buffered until the
+batch is full or the oldest call has waited long enough, then handled by a single batch call.
+This pays off when each call has a fixed cost - a round trip, a lock, a NumPy dispatch - that a
+batch pays once.
+
+Class(es):
+    None
+
+Function(s):
+    batched(int, float) -> function
+    async_batched(int, float) -> function
+    main() -> None
+"""
+
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Optional
+
+
+class _Batch:
+    """
+    Items collected for one batch call, and its results once made.
+    """
+
+    __slots__ = ("items", "results", "error", "done")
+
+    def __init__(self) -> None:
+        self.items: list = []
+        self.results: list = []
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+def _check_results(items: list, results: Any) -> list:
+    """
+    Check a batch function returned one result per item.
+
+    Raises:
+        ValueError: Wrong number of results
+    """
+
+    results = list(results)
+    if len(results) != len(items):
+        raise ValueError(f"Batch function returned {len(results)} results for {len(items)} items")
+
+    return results
+
+
+def batched(max_size: int = 64, max_delay: float = 0.005):
+    """
+    Decorator turning a batch function f(items) -> results into one called per item from many
+    threads.  The first call of a batch waits up to max_delay seconds for other threads' calls
+    to join it, or less if the batch fills to max_size first, then makes the batch call on behalf
+    of all of them.  An error from the batch call is raised in every caller of the batch.
+
+    A lone caller always waits max_delay, so only batch calls that are frequent and concurrent.
+    Call decorated.many(items) to handle a list of items directly, in batches of max_size.
+
+    Args:
+        max_size (int): Most items in a batch. Defaults to 64.
+        max_delay (float): Longest a call waits for its batch to fill, in seconds. Defaults to
+            0.005.
+    """
+
+    def decorator_func(function):
+        condition = threading.Condition(threading.Lock())
+        current = _Batch()
+
+        @wraps(function)
+        def wrapper_func(item):
+            nonlocal current
+
+            with condition:
+                batch = current
+                index = len(batch.items)
+                batch.items.append(item)
+
+                if index + 1 == max_size:
+                    # The batch is full - start the next one and wake this one's leader
+                    current = _Batch()
+                    condition.notify_all()
+
+                leader = not index
+                if leader:
+                    # First in the batch: wait for it to fill, then stop collecting into it
+                    condition.wait_for(lambda: len(batch.items) >= max_size, max_delay)
+                    if current is batch:
+                        current = _Batch()
+
+            if leader:
+                try:
+                    batch.results = _check_results(batch.items, function(batch.items))
+                except BaseException as error:  # pylint: disable=W0703
+                    batch.error = error
+                batch.done.set()
+            else:
+                batch.done.wait()
+
+            if batch.error is not None:
+                raise batch.error
+            return batch.results[index]
+
+        def many(items: list) -> list:
+            results = []
+            for start in range(0, len(items), max_size):
+                chunk = items[start : start + max_size]
+                results += _check_results(chunk, function(chunk))
+            return results
+
+        wrapper_func.many = many
+
+        return wrapper_func
+
+    return decorator_func
+
+
+def async_batched(max_size: int = 64, max_delay: float = 0.005):
+    """
+    Decorator turning a batch function f(items) -> results, regular or async, into a coroutine
+    function called per item from many tasks.  Calls are buffered until max_size items are
+    waiting or max_delay seconds have passed since the first, then dispatched as one batch call
+    on the event loop.  An error from the batch call is raised in every caller of the batch.
+
+    Args:
+        max_size (int): Most items in a batch. Defaults to 64.
+        max_delay (float): Longest a call waits for its batch to fill, in seconds. Defaults to
+            0.005.
+    """
+
+    def decorator_func(function):
+        is_async = inspect.iscoroutinefunction(function)
+        # Items and futures of the batch being collected, with its timer, per event loop
+        pending: dict[asyncio.AbstractEventLoop, tuple[list, list, asyncio.TimerHandle]] = {}
+        # Dispatch tasks still running - the event loop only keeps weak references to tasks
+        tasks: set[asyncio.Task] = set()
+
+        async def dispatch(items: list, futures: list) -> None:
+            try:
+                results = function(items)
+                if is_async:
+                    results = await results
+                results = _check_results(items, results)
+            except BaseException as error:  # pylint: disable=W0703
+                # Even when the dispatch itself is cancelled, no caller may be left waiting
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(error, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
+                if not isinstance(error, Exception):
+                    raise
+                return
+
+            for future, result in zip(futures, results):
+                if not future.done():  # Its caller may have been cancelled
+                    future.set_result(result)
+
+        def flush(loop: asyncio.AbstractEventLoop) -> None:
+            items, futures, timer = pending.pop(loop)
+            timer.cancel()
+            task = loop.create_task(dispatch(items, futures))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        @wraps(function)
+        async def wrapper_func(item):
+            loop = asyncio.get_running_loop()
+            batch = pending.get(loop)
+            if batch is None:
+                batch = pending[loop] = ([], [], loop.call_later(max_delay, flush, loop))
+
+            items, futures, _ = batch
+            future = loop.create_future()
+            items.append(item)
+            futures.append(future)
+            if len(items) >= max_size:
+                flush(loop)
+
+            return await future
+
+        return wrapper_func
+
+    return decorator_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    # A price service with a 1 ms round trip that handles one request at a time
+    service = threading.Lock()
+    requests = [0]
+
+    def lookup_prices(skus: list[int]) -> list[int]:
+        with service:
+            requests[0] += 1
+            time.sleep(0.001 + 0.00001 * len(skus))
+            return [sku * 100 for sku in skus]
+
+    def lookup_price(sku: int) -> int:
+        return lookup_prices([sku])[0]
+
+    batched_price = batched(max_size=64, max_delay=0.002)(lookup_prices)
+    skus = list(range(2_000))
+
+    for name, function in (("Per item", lookup_price), ("batched", batched_price)):
+        requests[0] = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            prices = list(executor.map(function, skus))
+        end = time.perf_counter()
+        assert prices == [sku * 100 for sku in skus]
+        print(f"{name}, 64 threads: {end-start:.03f} seconds, {requests[0]} requests")
+
+    requests[0] = 0
+    start = time.perf_counter()
+    batched_price.many(skus)
+    end = time.perf_counter()
+    print(f"batched.many: {end-start:.03f} seconds, {requests[0]} requests")
+
+    # The same service behind asyncio, one lookup at a time
+    async def async_lookup_prices(skus: list[int]) -> list[int]:
+        requests[0] += 1
+        await asyncio.sleep(0.001 + 0.00001 * len(skus))
+        return [sku * 100 for sku in skus]
+
+    async_service = asyncio.Lock()
+
+    async def async_lookup_price(sku: int) -> int:
+        async with async_service:
+            return (await async_lookup_prices([sku]))[0]
+
+    async def run(function) -> list[int]:
+        return await asyncio.gather(*(function(sku) for sku in skus))
+
+    for name, function in (
+        ("Per item", async_lookup_price),
+        ("async_batched", async_batched()(async_lookup_prices)),
+    ):
+        requests[0] = 0
+        start = time.perf_counter()
+        prices = asyncio.run(run(function))
+        end = time.perf_counter()
+        assert prices == [sku * 100 for sku in skus]
+        print(f"{name}, {len(skus)} tasks: {end-start:.03f} seconds, {requests[0]} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ Functions:
     display_info(str, int)
     my_logger(function) -> function
     logging_info(str, int)
+    main() -> None
 """
 
 import logging
@@ -135,12 +136,20 @@ def my_logger(function):
     Returns:
         function: The decorated function
     """
-    logging.basicConfig(filename=f"{function.__name__}.log", level=logging.INFO)
+    configured = False
 
     # Use wraps decorator to preserve info of original function passed to decorator
     # This is always important, but especially in case of chained decorators
     @wraps(function)
     def wrapper_func(*args, **kwargs):
+        nonlocal configured
+
+        # Configured on the first call rather than at decoration time, so importing a module
+        # with logged functions doesn't create log files
+        if not configured:
+            logging.basicConfig(filename=f"{function.__name__}.log", level=logging.INFO)
+            configured = True
+
         logging.info("Ran with args: %s and kwargs: %s", args, kwargs)
         return function(*args, **kwargs)
 
@@ -160,5 +169,21 @@ def logging_info(name: str, age: int):
     print(f"logging_info ran with arguments ({name}, {age})")
 
 
-# Example of a decorated multi-argument function being timed and logged using Python decorator syntax
-logging_info("Bill", 25)
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    # Example of a decorated multi-argument function being timed and logged using Python
+    # decorator syntax
+    logging_info("Bill", 25)
+
+
+if __name__ == "__main__":
+    main()
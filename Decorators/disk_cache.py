@@ -0,0 +1,420 @@
+"""
+Custom module for a persistent memoization decorator.  Results are cached in files on local disk,
+so expensive pure functions keep their results across restarts; the cache is keyed by the
+function's identity, a hash of its source (editing the function starts a fresh cache) and its
+arguments.  NumPy array results can be stored as .npy files and reloaded memory-mapped, without
+copying them into memory.
+
+Class(es):
+    DiskCacheInfo
+
+Function(s):
+    disk_cache(Optional[str], Optional[int], bool) -> function
+    main() -> None
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any, Optional
+
+from simple_timer import simple_timer
+
+# Used when no directory is given, overridden by the DISK_CACHE_DIR environment variable.  Under
+# the user's own cache directory, as entries are unpickled and must not be planted by others.
+DEFAULT_DIRECTORY = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "disk_cache"
+
+# Pickle protocol 5 writes large buffers (bytes, arrays) out of band efficiently
+_PICKLE_PROTOCOL = 5
+
+
+@dataclass(frozen=True)
+class DiskCacheInfo:
+    """
+    Snapshot of a disk-cached function's statistics in this process.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    directory: str
+
+
+def _source_hash(function) -> str:
+    """
+    Hash a function's source code, falling back to its bytecode and constants when the source
+    isn't available (e.g. functions defined in a REPL).
+
+    Args:
+        function (function): Function to hash
+
+    Returns:
+        str: Hex digest
+    """
+
+    try:
+        source = inspect.getsource(function).encode()
+    except (OSError, TypeError):
+        code = function.__code__
+        source = code.co_code + repr(code.co_consts).encode()
+
+    return hashlib.sha256(source).hexdigest()
+
+
+def _args_hash(args: tuple, kwargs: dict) -> str:
+    """
+    Hash a call's arguments.  Arguments must be picklable, and equal arguments must pickle the
+    same way for the cache to hit.
+
+    Args:
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+
+    Returns:
+        str: Hex digest
+    """
+
+    payload = pickle.dumps((args, sorted(kwargs.items())), protocol=_PICKLE_PROTOCOL)
+
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _is_mappable_array(value: Any) -> bool:
+    """
+    Whether value is a NumPy array that can be saved as a .npy file and memory-mapped back.  If
+    NumPy hasn't been imported, nothing can have returned an array, so it is never imported here.
+    """
+
+    numpy = sys.modules.get("numpy")
+
+    return (
+        numpy is not None
+        and type(value) is numpy.ndarray  # Not subclasses like memmap, which np.save flattens
+        and not value.dtype.hasobject
+    )
+
+
+def _write_atomic(path: Path, value: Any, as_array: bool) -> int:
+    """
+    Write value to path via a temporary file in the same directory and an atomic rename, so other
+    threads and processes never see a partly written entry.
+
+    Args:
+        path (Path): Destination file
+        value (Any): Value to write
+        as_array (bool): Write value with np.save rather than pickle
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            if as_array:
+                sys.modules["numpy"].save(file, value, allow_pickle=False)
+            else:
+                pickle.dump(value, file, protocol=_PICKLE_PROTOCOL)
+            size = file.tell()
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return size
+
+
+def _secure_directory(directory: Path) -> None:
+    """
+    Create directory, readable by the current user only, or check that an existing one belongs to
+    the current user and can't be written by anyone else.  Cached entries are unpickled, so
+    anyone able to write them could run code in this process.
+
+    Args:
+        directory (Path): Cache directory
+
+    Raises:
+        PermissionError: The directory is owned by another user, or writable by others
+    """
+
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, "getuid"):  # Windows, where per-user directories are protected by ACLs
+        return
+
+    stat = directory.stat()
+    if stat.st_uid != os.getuid():
+        raise PermissionError(f"Cache directory {directory} is owned by another user")
+    if stat.st_mode & 0o022:
+        raise PermissionError(f"Cache directory {directory} is writable by other users")
+
+
+def _evict(directory: Path, max_bytes: int, keep: Optional[Path] = None) -> tuple[int, int]:
+    """
+    Delete the least recently used entries under directory until it holds at most max_bytes.
+    Entries are ordered by modification time, which a cache hit refreshes.
+
+    Args:
+        directory (Path): Cache directory shared by every function
+        max_bytes (int): Size limit
+        keep (Optional[Path], optional): Entry never deleted, e.g. the one just written, which
+            may be about to be read back. Defaults to None.
+
+    Returns:
+        tuple[int, int]: Entries deleted and bytes remaining
+    """
+
+    entries = []
+    total = 0
+    for path in directory.glob("*/*"):
+        if path.suffix not in (".pkl", ".npy"):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # Evicted by another process meanwhile
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    deleted = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+            deleted += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+
+    return deleted, total
+
+
+def disk_cache(
+    directory: Optional[str] = None,
+    max_bytes: Optional[int] = 1 << 30,
+    mmap_arrays: bool = False,
+):
+    """
+    Decorator that memoizes a pure function's results in files on local disk.  Can be used bare
+    (@disk_cache) or with arguments (@disk_cache(max_bytes=1 << 20, mmap_arrays=True)).
+
+    Each function gets a subdirectory named after its module, qualified name and source hash, and
+    each call a file named after the hash of its arguments.  Entries are written atomically, so
+    several processes can share a cache directory.  Once the whole directory grows past
+    max_bytes, the least recently used entries are deleted.  Entries for old versions of a
+    function are never read again and age out the same way.
+
+    With mmap_arrays, NumPy array results are stored as .npy files and returned as read-only
+    memory maps on later calls, so reloading them costs no copy however large they are.  Other
+    results are pickled.  The decorated function gains cache_info() and cache_clear().
+
+    Args:
+        directory (Optional[str]): Cache directory, which must belong to the current user and
+            not be writable by others. Defaults to $DISK_CACHE_DIR, or disk_cache under the
+            user's cache directory ($XDG_CACHE_HOME or ~/.cache).
+        max_bytes (Optional[int]): Size limit of the whole directory, None for no limit.
+            Defaults to 1 GiB.
+        mmap_arrays (bool): Store NumPy arrays as .npy files and reload them memory-mapped.
+            Defaults to False.
+    """
+
+    if callable(directory):
+        # Used bare, so directory is actually the function being decorated
+        return disk_cache()(directory)
+
+    root = Path(directory or os.environ.get("DISK_CACHE_DIR") or DEFAULT_DIRECTORY)
+
+    def decorator_func(function):
+        name = f"{function.__module__}.{function.__qualname__}".replace("<", "").replace(">", "")
+        namespace = root / f"{name}-{_source_hash(function)[:16]}"
+        lock = threading.Lock()
+        hits = misses = evictions = 0
+        # Whether root has been created or checked, done on the first call rather than at import
+        secured = False
+        # Size of the directory when last measured plus bytes written since, None until measured
+        directory_bytes: Optional[int] = None
+
+        def load(key: str) -> Any:
+            """
+            Return the cached value for key, raising FileNotFoundError on a miss.
+            """
+
+            if mmap_arrays:
+                array_path = namespace / f"{key}.npy"
+                if array_path.exists():
+                    # A fresh process may not have imported NumPy yet
+                    try:
+                        import numpy  # pylint: disable=C0415
+                    except ImportError:
+                        pass  # Unreadable here - look for a pickled entry, or recompute
+                    else:
+                        value = numpy.load(array_path, mmap_mode="r")
+                        os.utime(array_path)
+                        return value
+
+            path = namespace / f"{key}.pkl"
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+            os.utime(path)
+            return value
+
+        def store(key: str, value: Any) -> None:
+            nonlocal evictions, directory_bytes
+
+            as_array = mmap_arrays and _is_mappable_array(value)
+            path = namespace / f"{key}.npy" if as_array else namespace / f"{key}.pkl"
+            namespace.mkdir(mode=0o700, exist_ok=True)
+            size = _write_atomic(path, value, as_array)
+
+            if max_bytes is None:
+                return
+
+            # Only rescan the directory once enough has been written that it could be full, and
+            # then trim it to 90% so the next rescan is some writes away
+            with lock:
+                if directory_bytes is not None:
+                    directory_bytes += size
+                    if directory_bytes <= max_bytes:
+                        return
+                deleted, total = _evict(root, max_bytes * 9 // 10, keep=path)
+                evictions += deleted
+                directory_bytes = total
+
+        @wraps(function)
+        def wrapper_func(*args, **kwargs):
+            nonlocal hits, misses, secured
+
+            if not secured:
+                _secure_directory(root)
+                secured = True
+
+            key = _args_hash(args, kwargs)
+            try:
+                value = load(key)
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+                # Missing, or damaged outside our atomic writes - recompute and overwrite
+                pass
+            else:
+                with lock:
+                    hits += 1
+                return value
+
+            with lock:
+                misses += 1
+            value = function(*args, **kwargs)
+            store(key, value)
+
+            if mmap_arrays and _is_mappable_array(value):
+                # Hand back the same read-only memory map a later call would get, unless another
+                # process has evicted the entry already
+                try:
+                    return load(key)
+                except (FileNotFoundError, ValueError):
+                    pass
+            return value
+
+        def cache_info() -> DiskCacheInfo:
+            return DiskCacheInfo(
+                hits=hits, misses=misses, evictions=evictions, directory=str(namespace)
+            )
+
+        def cache_clear() -> None:
+            """
+            Delete every entry of this function from disk.
+            """
+
+            nonlocal hits, misses, evictions
+
+            shutil.rmtree(namespace, ignore_errors=True)
+            hits = misses = evictions = 0
+
+        wrapper_func.cache_info = cache_info
+        wrapper_func.cache_clear = cache_clear
+
+        return wrapper_func
+
+    return decorator_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        def estimate_pi(n: int) -> float:
+            inside = 0
+            for i in range(n):
+                x = (i * 0.6180339887) % 1.0
+                y = (i * 0.7548776662) % 1.0
+                inside += x * x + y * y <= 1.0
+            return 4 * inside / n
+
+        cached_pi = disk_cache(directory)(estimate_pi)
+
+        print("First call, computed:")
+        simple_timer(cached_pi)(5_000_000)
+        print("Second call, read from disk:")
+        simple_timer(cached_pi)(5_000_000)
+
+        # A new process decorating the same function finds the same entries
+        restarted_pi = disk_cache(directory)(estimate_pi)
+        print("After a restart:")
+        simple_timer(restarted_pi)(5_000_000)
+        print(cached_pi.cache_info(), restarted_pi.cache_info())
+
+        # Size-bounded: 100 ~8 KiB entries in a 256 KiB cache
+        @disk_cache(directory, max_bytes=1 << 18)
+        def table(seed: int) -> bytes:
+            return bytes(seed % 256 for _ in range(8_192))
+
+        for seed in range(100):
+            table(seed)
+        size = sum(path.stat().st_size for path in Path(directory).glob("*/*"))
+        print(f"{table.cache_info()}, {size / 1024:.0f} KiB on disk")
+
+        try:
+            import numpy as np  # pylint: disable=C0415
+        except ImportError:
+            return
+
+        @disk_cache(directory, max_bytes=None, mmap_arrays=True)
+        def grid(n: int) -> np.ndarray:
+            x = np.linspace(0.0, 1.0, n)
+            return np.sqrt(x[:, None] ** 2 + x[None, :] ** 2)
+
+        for _ in range(2):
+            start = time.perf_counter()
+            result = grid(4_000)
+            end = time.perf_counter()
+            print(f"grid(4000) -> {type(result).__name__}: {end-start:.05f} seconds")
+
+        # An entry bigger than the whole cache is still returned, then evicted by the next write
+        @disk_cache(directory, max_bytes=1 << 16, mmap_arrays=True)
+        def zeros(n: int) -> np.ndarray:
+            return np.zeros(n)
+
+        print(f"zeros(100000) in a 64 KiB cache -> {type(zeros(100_000)).__name__}")
+
+
+if __name__ == "__main__":
+    main()
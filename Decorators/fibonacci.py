@@ -11,17 +11,18 @@ Function(s):
 """
 
 from time import time as timer
-from functools import cache
+
+from memoize import memoize
 from simple_timer import simple_timer
 
 
-@cache
+@memoize(max_size=256)
 def rec_fib_seq(n: int) -> int:
     """
     Recursively calculate the Fibonacci number for the numbers 0 to n (exclusive).
 
-    The cache decorator stores values to be applied to subsequent calcuations, greatly
-    reducing compute time.
+    The memoize decorator stores values to be applied to subsequent calcuations, greatly
+    reducing compute time.  Its cache is bounded, keeping only the 256 most recently used terms.
 
     Args:
         n (int): The nth term in the Fibonacci sequence to be calculated
@@ -0,0 +1,365 @@
+"""
+Custom module for fusing stacked decorators into one wrapper.  Decorators like decorator_func and
+prefix_decorator each add a *args, **kwargs wrapper, so every decorator in a stack repacks the
+arguments and adds a call.  Written as Hooks - a before and/or after function - a whole stack
+runs in a single generated wrapper with the decorated function's exact signature.  Instrumentation
+can also be stripped out entirely, leaving the undecorated function.
+
+Class(es):
+    Hook
+
+Function(s):
+    fuse(*Hook) -> function
+    set_instrumentation(bool) -> None
+    instrumentation(function) -> function
+    main() -> None
+"""
+
+import inspect
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from functools import update_wrapper
+from typing import Any, Callable, Optional
+
+from decorators import DecoratorClass
+
+# Instrumentation decorators return the function unchanged when this is False
+INSTRUMENTATION_ENABLED = os.environ.get("STRIP_INSTRUMENTATION", "") in ("", "0")
+
+# The original function and hooks of every wrapper fuse generated
+_FUSED: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def set_instrumentation(enabled: bool) -> None:
+    """
+    Switch instrumentation on or off for functions decorated from now on.  Set the environment
+    variable STRIP_INSTRUMENTATION=1 to start with it off.
+
+    Args:
+        enabled (bool): Apply instrumentation decorators
+    """
+
+    global INSTRUMENTATION_ENABLED  # pylint: disable=W0603
+
+    INSTRUMENTATION_ENABLED = enabled
+
+
+def instrumentation(decorator):
+    """
+    Mark an ordinary decorator as instrumentation, so that it is skipped while instrumentation
+    is switched off, e.g. timed_if_enabled = instrumentation(simple_timer).
+
+    Args:
+        decorator (function): Decorator to mark
+
+    Returns:
+        function: The decorator, or one returning the function unchanged
+    """
+
+    def decorator_wrapper(function):
+        if not INSTRUMENTATION_ENABLED:
+            return function
+        return decorator(function)
+
+    return decorator_wrapper
+
+
+@dataclass(frozen=True)
+class Hook:
+    """
+    A decorator reduced to what it does around a call.  A Hook is itself a decorator, and
+    stacking Hooks fuses them into one wrapper.
+
+    Instance Attributes:
+        before (Optional[Callable]): Called as before(function) ahead of each call, or as
+            before(function, args, kwargs) with pass_args
+        after (Optional[Callable]): Called as after(function, result) after each call that
+            returns
+        pass_args (bool): Pass the call's arguments to before, built as a tuple and a dict
+        instrumentation (bool): Skip the hook while instrumentation is switched off
+    """
+
+    before: Optional[Callable[..., None]] = None
+    after: Optional[Callable[[Callable, Any], None]] = None
+    pass_args: bool = False
+    instrumentation: bool = True
+
+    def __call__(self, function):
+        return fuse(self)(function)
+
+
+def _parameter_source(
+    signature: inspect.Signature, namespace: dict
+) -> tuple[str, str, str, str]:
+    """
+    Spell out a signature as source code for a generated wrapper.  Defaults are stored in
+    namespace rather than written out, so the wrapper shares the original default objects.
+
+    Args:
+        signature (inspect.Signature): Signature of the wrapped function
+        namespace (dict): Names visible to the generated code
+
+    Returns:
+        tuple[str, str, str, str]: Parameter list, call arguments, and the expressions packing
+            the call into an args tuple and a kwargs dict
+    """
+
+    parameters, call, packed_args, packed_kwargs = [], [], [], []
+    positional_only = keyword_only = False
+
+    for index, parameter in enumerate(signature.parameters.values()):
+        name = parameter.name
+        text = name
+        if parameter.default is not parameter.empty:
+            namespace[f"_fused_default_{index}"] = parameter.default
+            text = f"{name}=_fused_default_{index}"
+
+        if parameter.kind is parameter.POSITIONAL_ONLY:
+            positional_only = True
+        elif positional_only:
+            parameters.append("/")
+            positional_only = False
+
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            parameters.append(text)
+            call.append(name)
+            packed_args.append(name)
+        elif parameter.kind is parameter.VAR_POSITIONAL:
+            parameters.append(f"*{name}")
+            call.append(f"*{name}")
+            packed_args.append(f"*{name}")
+            keyword_only = True
+        elif parameter.kind is parameter.KEYWORD_ONLY:
+            if not keyword_only:
+                parameters.append("*")
+                keyword_only = True
+            parameters.append(text)
+            call.append(f"{name}={name}")
+            packed_kwargs.append(f"{name!r}: {name}")
+        else:
+            parameters.append(f"**{name}")
+            call.append(f"**{name}")
+            packed_kwargs.append(f"**{name}")
+
+    if positional_only:
+        parameters.append("/")
+
+    return (
+        ", ".join(parameters),
+        ", ".join(call),
+        f"({', '.join(packed_args)}{',' if len(packed_args) == 1 else ''})",
+        f"{{{', '.join(packed_kwargs)}}}",
+    )
+
+
+# Names the generated wrapper uses for itself; a parameter starting with this would clash
+_RESERVED_PREFIX = "_fused_"
+
+
+def _closure_wrapper(function, active: list[Hook]):
+    """
+    Plain *args, **kwargs wrapper running the same hooks as a generated one, for functions whose
+    parameter names would clash with the generated wrapper's own names.
+
+    Args:
+        function (function): Function to wrap
+        active (list[Hook]): Hooks to run, outermost first
+
+    Returns:
+        function: The wrapper
+    """
+
+    signature = inspect.signature(function)
+
+    def run_before(args: tuple, kwargs: dict) -> None:
+        bound = None
+        for hook in active:
+            if hook.before is not None:
+                if hook.pass_args:
+                    if bound is None:
+                        # Pack the call like the generated wrapper, by parameter with defaults
+                        bound = signature.bind(*args, **kwargs)
+                        bound.apply_defaults()
+                    hook.before(function, bound.args, bound.kwargs)
+                else:
+                    hook.before(function)
+
+    def run_after(result: Any) -> None:
+        for hook in reversed(active):
+            if hook.after is not None:
+                hook.after(function, result)
+
+    if inspect.iscoroutinefunction(function):
+
+        async def async_wrapper(*args, **kwargs):
+            run_before(args, kwargs)
+            result = await function(*args, **kwargs)
+            run_after(result)
+            return result
+
+        return async_wrapper
+
+    def wrapper(*args, **kwargs):
+        run_before(args, kwargs)
+        result = function(*args, **kwargs)
+        run_after(result)
+        return result
+
+    return wrapper
+
+
+def fuse(*hooks: Hook):
+    """
+    Decorator running a stack of Hooks in one generated wrapper, in the same order as stacked
+    decorators: @fuse(a, b) behaves like @a @b, so a.before runs first and a.after last.  The
+    wrapper has the function's exact signature and calls it directly, without repacking
+    *args and **kwargs.  Fusing an already fused function adds the new hooks to its wrapper
+    rather than wrapping it again.  Functions with a parameter named _fused_* get a plain
+    *args, **kwargs wrapper instead, as those names are taken by the generated code.
+
+    Args:
+        *hooks (Hook): Hooks to run, outermost first
+    """
+
+    def decorator_func(function):
+        active = [hook for hook in hooks if INSTRUMENTATION_ENABLED or not hook.instrumentation]
+
+        # Merge with hooks fused into the function already, wrapping the original once
+        fused = _FUSED.get(function)
+        if fused is not None:
+            function, fused_hooks = fused
+            active += fused_hooks
+        if not active:
+            return function
+
+        signature = inspect.signature(function)
+        if any(name.startswith(_RESERVED_PREFIX) for name in signature.parameters):
+            wrapper = update_wrapper(_closure_wrapper(function, active), function)
+            _FUSED[wrapper] = (function, active)
+            return wrapper
+
+        namespace: dict[str, Any] = {"_fused_function": function}
+        parameters, call, packed_args, packed_kwargs = _parameter_source(signature, namespace)
+        is_async = inspect.iscoroutinefunction(function)
+
+        body = []
+        if any(hook.before is not None and hook.pass_args for hook in active):
+            body.append(f"_fused_args, _fused_kwargs = {packed_args}, {packed_kwargs}")
+        for index, hook in enumerate(active):
+            if hook.before is not None:
+                namespace[f"_fused_before_{index}"] = hook.before
+                arguments = ", _fused_args, _fused_kwargs" if hook.pass_args else ""
+                body.append(f"_fused_before_{index}(_fused_function{arguments})")
+        body.append(f"_fused_result = {'await ' if is_async else ''}_fused_function({call})")
+        for index, hook in reversed(list(enumerate(active))):
+            if hook.after is not None:
+                namespace[f"_fused_after_{index}"] = hook.after
+                body.append(f"_fused_after_{index}(_fused_function, _fused_result)")
+        body.append("return _fused_result")
+
+        source = (
+            f"{'async ' if is_async else ''}def _fused_wrapper({parameters}):\n"
+            + "".join(f"    {line}\n" for line in body)
+        )
+        exec(source, namespace)  # pylint: disable=W0122
+
+        wrapper = update_wrapper(namespace["_fused_wrapper"], function)
+        _FUSED[wrapper] = (function, active)
+
+        return wrapper
+
+    return decorator_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    def announce(function):
+        print(f"Wrapper function executed this before {function.__name__}")
+
+    def report(function, result):
+        print(f"{function.__name__} returned {result}")
+
+    @Hook(before=announce)
+    @Hook(after=report)
+    def display_info(name: str, age: int, *, height: int = 72) -> str:
+        return f"{name}, {age}, {height}"
+
+    display_info("Craig", 40)
+    print(
+        f"{len(_FUSED[display_info][1])} hooks in one wrapper, "
+        f"signature {inspect.signature(display_info)}"
+    )
+
+    calls = 1_000_000
+    counts = [0]
+
+    def count(_function):
+        counts[0] += 1
+
+    def generic_decorator(function):
+        def wrapper_func(*args, **kwargs):
+            count(function)
+            return function(*args, **kwargs)
+
+        return wrapper_func
+
+    class GenericDecoratorClass(DecoratorClass):
+        def __call__(self, *args, **kwargs):
+            count(self.function)
+            return self.function(*args, **kwargs)
+
+    def add(a, b, c=1):
+        return a + b + c
+
+    print(f"undecorated: {time_calls(add, calls):.0f} ns per call")
+    for depth in (1, 3, 5):
+        stacks = {
+            "decorator_func": generic_decorator,
+            "DecoratorClass": GenericDecoratorClass,
+            "fuse": Hook(before=count),
+        }
+        for name, decorator in stacks.items():
+            function = add
+            for _ in range(depth):
+                function = decorator(function)
+            print(f"{depth} x {name}: {time_calls(function, calls):.0f} ns per call")
+
+    set_instrumentation(False)
+    stripped = fuse(*[Hook(before=count)] * 5)(add)
+    print(f"5 x fuse, stripped: {time_calls(stripped, calls):.0f} ns per call")
+    set_instrumentation(True)
+
+
+def time_calls(function: Callable, calls: int) -> float:
+    """
+    Time calling function(1, 2) calls times.
+
+    Args:
+        function (Callable): Function to time
+        calls (int): Number of calls
+
+    Returns:
+        float: Nanoseconds per call
+    """
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        function(1, 2)
+    end = time.perf_counter()
+
+    return (end - start) / calls * 1e9
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Custom module for decorators that protect a downstream resource from bursts of calls: rate_limit
+spaces calls out with a token bucket, concurrency_limit caps how many run at once.  Both work on
+regular and async functions, and either queue calls over the limit or reject them.  Limits are
+set at decoration time, like prefix_decorator, and shared by every caller of the function.
+
+Class(es):
+    LimitExceededError
+    RateLimitExceededError
+    ConcurrencyLimitExceededError
+    LimitStats
+
+Function(s):
+    rate_limit(float, Optional[int], str, Optional[float]) -> function
+    concurrency_limit(int, str, Optional[float]) -> function
+    main() -> None
+"""
+
+import asyncio
+import contextlib
+import inspect
+import io
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+QUEUE = "queue"
+REJECT = "reject"
+
+
+class LimitExceededError(Exception):
+    """Custom error that is raised when a call is over a decorator's limit and can't wait."""
+
+
+class RateLimitExceededError(LimitExceededError):
+    """Custom error that is raised when a rate limited call is rejected."""
+
+
+class ConcurrencyLimitExceededError(LimitExceededError):
+    """Custom error that is raised when a concurrency limited call is rejected."""
+
+
+@dataclass(frozen=True)
+class LimitStats:
+    """
+    Snapshot of a limited function's statistics.  Wait times are in seconds.
+    """
+
+    calls: int
+    rejected: int
+    waited: int
+    total_wait: float
+    max_wait: float
+
+
+class _Metrics:
+    """
+    Thread-safe counters behind LimitStats.
+    """
+
+    __slots__ = ("calls", "rejected", "waited", "total_wait", "max_wait", "lock")
+
+    def __init__(self) -> None:
+        self.calls = self.rejected = self.waited = 0
+        self.total_wait = self.max_wait = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, wait: float) -> None:
+        with self.lock:
+            self.calls += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+    def reject(self) -> None:
+        with self.lock:
+            self.rejected += 1
+
+    def stats(self) -> LimitStats:
+        with self.lock:
+            return LimitStats(
+                calls=self.calls,
+                rejected=self.rejected,
+                waited=self.waited,
+                total_wait=self.total_wait,
+                max_wait=self.max_wait,
+            )
+
+
+def _check_policy(policy: str) -> None:
+    if policy not in (QUEUE, REJECT):
+        raise ValueError(f"Expect policy '{QUEUE}' or '{REJECT}', got {policy!r}")
+
+
+def rate_limit(
+    rate: float,
+    burst: Optional[int] = None,
+    policy: str = QUEUE,
+    timeout: Optional[float] = None,
+):
+    """
+    Decorator that lets calls through at most rate times a second on average, with bursts of up
+    to burst calls.  A call over the limit waits for its turn (policy "queue") or raises
+    RateLimitExceededError (policy "reject").  Queued calls reserve their slot before waiting,
+    so they go through in arrival order without polling.  The decorated function gains
+    limit_stats().
+
+    Args:
+        rate (float): Calls per second
+        burst (Optional[int]): Calls allowed at once after a quiet spell. Defaults to rate,
+            rounded up.
+        policy (str): "queue" or "reject". Defaults to "queue".
+        timeout (Optional[float]): With "queue", reject calls that would wait longer than this
+            many seconds. Defaults to None.
+
+    Raises:
+        ValueError: rate must be positive and policy "queue" or "reject"
+    """
+
+    if rate <= 0:
+        raise ValueError(f"Expect positive rate, got {rate}")
+    _check_policy(policy)
+    capacity = float(burst if burst is not None else max(1, -int(-rate // 1)))
+
+    def decorator_func(function):
+        metrics = _Metrics()
+        lock = threading.Lock()
+        tokens = capacity
+        refilled = time.monotonic()
+
+        def reserve() -> float:
+            """
+            Take a token, returning how long to wait until it is valid.
+            """
+
+            nonlocal tokens, refilled
+
+            with lock:
+                now = time.monotonic()
+                tokens = min(capacity, tokens + (now - refilled) * rate)
+                refilled = now
+
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+                if wait and (policy == REJECT or (timeout is not None and wait > timeout)):
+                    metrics.reject()
+                    raise RateLimitExceededError(f"{function.__qualname__} over {rate}/s")
+
+                tokens -= 1  # May go negative: the calls queued behind this one wait longer
+
+            metrics.record(wait)
+            return wait
+
+        if inspect.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def wrapper_func(*args, **kwargs):
+                wait = reserve()
+                if wait:
+                    await asyncio.sleep(wait)
+                return await function(*args, **kwargs)
+
+        else:
+
+            @wraps(function)
+            def wrapper_func(*args, **kwargs):
+                wait = reserve()
+                if wait:
+                    time.sleep(wait)
+                return function(*args, **kwargs)
+
+        wrapper_func.limit_stats = metrics.stats
+
+        return wrapper_func
+
+    return decorator_func
+
+
+def concurrency_limit(max_concurrent: int, policy: str = QUEUE, timeout: Optional[float] = None):
+    """
+    Decorator that lets at most max_concurrent calls run at once - across threads for regular
+    functions, across tasks for async functions.  A call over the limit waits for a running one
+    to finish (policy "queue") or raises ConcurrencyLimitExceededError (policy "reject").  The
+    decorated function gains limit_stats().
+
+    Args:
+        max_concurrent (int): Calls allowed to run at once
+        policy (str): "queue" or "reject". Defaults to "queue".
+        timeout (Optional[float]): With "queue", reject calls that wait longer than this many
+            seconds. Defaults to None.
+
+    Raises:
+        ValueError: max_concurrent must be positive and policy "queue" or "reject"
+    """
+
+    if max_concurrent < 1:
+        raise ValueError(f"Expect positive max_concurrent, got {max_concurrent}")
+    _check_policy(policy)
+
+    def decorator_func(function):
+        metrics = _Metrics()
+
+        def rejected() -> ConcurrencyLimitExceededError:
+            metrics.reject()
+            return ConcurrencyLimitExceededError(
+                f"{function.__qualname__} already running {max_concurrent} calls"
+            )
+
+        if inspect.iscoroutinefunction(function):
+            # asyncio semaphores belong to one event loop, so keep one per loop
+            semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+            @wraps(function)
+            async def wrapper_func(*args, **kwargs):
+                loop = asyncio.get_running_loop()
+                semaphore = semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = semaphores[loop] = asyncio.Semaphore(max_concurrent)
+
+                if not semaphore.locked():
+                    await semaphore.acquire()  # Free, so this returns without suspending
+                    wait = 0.0
+                elif policy == REJECT:
+                    raise rejected()
+                else:
+                    start = time.monotonic()
+                    try:
+                        await asyncio.wait_for(semaphore.acquire(), timeout)
+                    except asyncio.TimeoutError:
+                        raise rejected() from None
+                    wait = time.monotonic() - start
+                metrics.record(wait)
+
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    semaphore.release()
+
+        else:
+            semaphore = threading.BoundedSemaphore(max_concurrent)
+
+            @wraps(function)
+            def wrapper_func(*args, **kwargs):
+                if semaphore.acquire(blocking=False):
+                    wait = 0.0
+                elif policy == REJECT:
+                    raise rejected()
+                else:
+                    start = time.monotonic()
+                    if not semaphore.acquire(timeout=timeout):
+                        raise rejected()
+                    wait = time.monotonic() - start
+                metrics.record(wait)
+
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    semaphore.release()
+
+        wrapper_func.limit_stats = metrics.stats
+
+        return wrapper_func
+
+    return decorator_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    # The point-of-sale system lives in a sibling directory and is written as a package script
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Classes" / "pos"))
+    from pos_system.payment import StripePaymentProcessor  # pylint: disable=C0415
+
+    def pay_many(processor: StripePaymentProcessor, payments: int) -> tuple[int, float]:
+        """
+        Make payments from 8 threads at once, returning how many went through and how long
+        it took.
+        """
+
+        def pay(reference: int) -> bool:
+            try:
+                processor.process_payment(f"ORDER{reference}", 1_000)
+            except LimitExceededError:
+                return False
+            return True
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                paid = sum(executor.map(pay, range(payments)))
+        end = time.perf_counter()
+
+        return paid, end - start
+
+    # At most 10 payments a second reach the payment service, in bursts of up to 5
+    for policy in (QUEUE, REJECT):
+
+        class LimitedProcessor(StripePaymentProcessor):
+            process_payment = rate_limit(10, burst=5, policy=policy)(
+                StripePaymentProcessor.process_payment
+            )
+
+        processor = LimitedProcessor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.connect_to_service("https://api.stripe.com/v2")
+        paid, elapsed = pay_many(processor, 20)
+        print(f"rate_limit({policy}): {paid}/20 paid in {elapsed:.02f} seconds")
+        print(f"    {LimitedProcessor.process_payment.limit_stats()}")
+
+    # At most 3 requests in flight at once
+    @concurrency_limit(3)
+    async def fetch(user_id: int) -> str:
+        await asyncio.sleep(0.1)
+        return f"user-{user_id}"
+
+    async def fetch_many() -> None:
+        await asyncio.gather(*(fetch(user_id) for user_id in range(12)))
+
+    start = time.perf_counter()
+    asyncio.run(fetch_many())
+    end = time.perf_counter()
+    print(f"concurrency_limit(3): 12 fetches in {end-start:.02f} seconds")
+    print(f"    {fetch.limit_stats()}")
+
+
+if __name__ == "__main__":
+    main()
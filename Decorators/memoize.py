@@ -0,0 +1,355 @@
+"""
+Custom module for a bounded memoization decorator, a replacement for functools.cache that won't
+grow without limit when it memoizes on request parameters.  Works on both regular and async
+functions, and coalesces concurrent calls for the same arguments onto one computation.
+
+Class(es):
+    CacheInfo
+
+Function(s):
+    memoize(Optional[int], Optional[float], Optional[int], Callable, bool) -> function
+    main() -> None
+"""
+
+import asyncio
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Any, Callable, Hashable, Optional, Union
+
+# Separates positional from keyword arguments in cache keys
+_KWARGS_MARK = object()
+
+# A single argument of one of these types is used as the cache key directly
+_SCALAR_KEY_TYPES = frozenset((int, str))
+
+# Returned by a cache lookup that found nothing (None is a valid cached value)
+_MISSING = object()
+
+
+class _Call:
+    """
+    An in-flight call of a regular function.  The computing thread holds done until the result
+    is in, so waiting threads block on acquiring it - far cheaper to set up than a Future.
+    """
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Lock()
+        self.done.acquire()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        """
+        Wait for the call to finish and return its value or raise its error.
+        """
+        with self.done:
+            pass
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    Snapshot of a memoized function's cache statistics.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    coalesced: int
+    max_size: Optional[int]
+    current_size: int
+    current_bytes: int
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    """
+    Build a cache key from a call's arguments.
+
+    Args:
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+
+    Returns:
+        Hashable: Cache key
+    """
+
+    if not kwargs:
+        return args
+
+    return (*args, _KWARGS_MARK, *sorted(kwargs.items()))
+
+
+def memoize(
+    max_size: Optional[int] = 128,
+    ttl: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    sizeof: Callable[[Any], int] = sys.getsizeof,
+    single_flight: bool = True,
+):
+    """
+    Decorator that memoizes a function's results in a bounded, thread-safe cache.  Can be used
+    bare (@memoize) or with arguments (@memoize(max_size=1024, ttl=60)), on regular functions
+    and on async def coroutine functions.
+
+    The least recently used entry is evicted once the cache holds max_size entries or its
+    results total more than max_bytes, and entries older than ttl seconds are recomputed.
+    The decorated function gains cache_info() and cache_clear(), like functools.lru_cache.
+
+    With single_flight, a call that misses while an identical call is already being computed
+    waits for that computation instead of starting its own - from other threads for regular
+    functions, from other tasks for coroutine functions.  Errors reach every waiting caller and
+    are not cached.
+
+    Args:
+        max_size (Optional[int]): Maximum number of entries, None for no limit. Defaults to 128.
+        ttl (Optional[float]): Seconds an entry stays valid, None for forever. Defaults to None.
+        max_bytes (Optional[int]): Maximum total size of cached results as measured by sizeof,
+            None for no limit. Defaults to None.
+        sizeof (Callable[[Any], int]): Size of a result in bytes. Defaults to sys.getsizeof.
+        single_flight (bool): Coalesce concurrent identical calls. Defaults to True.
+    """
+
+    if callable(max_size):
+        # Used bare, so max_size is actually the function being decorated
+        return memoize()(max_size)
+
+    def decorator_func(function):
+        cache: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        in_flight: dict[Hashable, Union[_Call, asyncio.Task]] = {}
+        lock = threading.Lock()
+        track_bytes = max_bytes is not None
+        hits = misses = evictions = expirations = coalesced = total_bytes = 0
+
+        def make_key(args: tuple, kwargs: dict) -> Hashable:
+            if not kwargs and len(args) == 1 and type(args[0]) in _SCALAR_KEY_TYPES:
+                return args[0]
+            return _make_key(args, kwargs)
+
+        def lookup(key: Hashable) -> Any:
+            """
+            Return the cached value for key, or _MISSING.  Call with lock held.
+            """
+            nonlocal hits, misses, expirations, total_bytes
+
+            entry = cache.get(key)
+            if entry is not None:
+                if ttl is None or entry[1] > time.monotonic():
+                    cache.move_to_end(key)
+                    hits += 1
+                    return entry[0]
+
+                del cache[key]
+                expirations += 1
+                total_bytes -= entry[2]
+
+            misses += 1
+            return _MISSING
+
+        def store(key: Hashable, value: Any) -> None:
+            """
+            Cache value under key and evict down to the limits.  Call with lock held.
+            """
+            nonlocal evictions, total_bytes
+
+            previous = cache.pop(key, None)
+            if previous is not None:
+                total_bytes -= previous[2]
+
+            expires = 0.0 if ttl is None else time.monotonic() + ttl
+            size = sizeof(value) if track_bytes else 0
+            cache[key] = (value, expires, size)
+            total_bytes += size
+
+            while cache and (
+                (max_size is not None and len(cache) > max_size)
+                or (track_bytes and total_bytes > max_bytes)
+            ):
+                _, (_, _, evicted_size) = cache.popitem(last=False)
+                total_bytes -= evicted_size
+                evictions += 1
+
+        @wraps(function)
+        def wrapper_func(*args, **kwargs):
+            nonlocal coalesced
+
+            key = make_key(args, kwargs)
+
+            # acquire/release rather than "with lock" - measurably cheaper on the hit path
+            lock.acquire()
+            try:
+                value = lookup(key)
+                if value is not _MISSING:
+                    return value
+
+                pending = in_flight.get(key) if single_flight else None
+                if pending is None:
+                    call = _Call()
+                    if single_flight:
+                        in_flight[key] = call
+                else:
+                    coalesced += 1
+            finally:
+                lock.release()
+
+            if pending is not None:
+                return pending.result()
+
+            # Compute outside the lock so recursive and concurrent calls aren't blocked
+            try:
+                call.value = function(*args, **kwargs)
+            except BaseException as error:
+                call.error = error
+                raise
+            finally:
+                with lock:
+                    in_flight.pop(key, None)
+                    if call.error is None:
+                        store(key, call.value)
+                call.done.release()
+
+            return call.value
+
+        @wraps(function)
+        async def async_wrapper_func(*args, **kwargs):
+            nonlocal coalesced
+
+            key = make_key(args, kwargs)
+            loop = asyncio.get_running_loop()
+
+            with lock:
+                value = lookup(key)
+                if value is not _MISSING:
+                    return value
+
+                pending = in_flight.get(key) if single_flight else None
+                if pending is None or pending.get_loop() is not loop:
+                    pending = loop.create_task(compute(key, args, kwargs))
+                    if single_flight:
+                        in_flight[key] = pending
+                else:
+                    coalesced += 1
+
+            # Shield the shared task so one caller being cancelled doesn't cancel the others
+            return await asyncio.shield(pending)
+
+        async def compute(key: Hashable, args: tuple, kwargs: dict) -> Any:
+            try:
+                value = await function(*args, **kwargs)
+            finally:
+                with lock:
+                    if in_flight.get(key) is asyncio.current_task():
+                        del in_flight[key]
+
+            with lock:
+                store(key, value)
+            return value
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(
+                    hits=hits,
+                    misses=misses,
+                    evictions=evictions,
+                    expirations=expirations,
+                    coalesced=coalesced,
+                    max_size=max_size,
+                    current_size=len(cache),
+                    current_bytes=total_bytes,
+                )
+
+        def cache_clear() -> None:
+            nonlocal hits, misses, evictions, expirations, coalesced, total_bytes
+
+            with lock:
+                cache.clear()
+                hits = misses = evictions = expirations = coalesced = total_bytes = 0
+
+        wrapper = async_wrapper_func if inspect.iscoroutinefunction(function) else wrapper_func
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+
+        return wrapper
+
+    return decorator_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    n = 1_000_000
+
+    @lru_cache(maxsize=128)
+    def square_lru(x: int) -> int:
+        return x * x
+
+    @memoize(max_size=128)
+    def square_memoize(x: int) -> int:
+        return x * x
+
+    @memoize(max_size=128, ttl=60, max_bytes=1 << 20)
+    def square_memoize_all(x: int) -> int:
+        return x * x
+
+    # Time cache hits - the per-call overhead of each decorator
+    for square in (square_lru, square_memoize, square_memoize_all):
+        square(7)
+        start = time.perf_counter()
+        for _ in range(n):
+            square(7)
+        end = time.perf_counter()
+        print(f"{square.__name__}: {(end - start) / n * 1e9:.0f} ns per cached call")
+
+    # Time a mix of hits, misses and evictions
+    for square in (square_lru, square_memoize, square_memoize_all):
+        start = time.perf_counter()
+        for i in range(n):
+            square(i % 256)
+        end = time.perf_counter()
+        print(f"{square.__name__}: {(end - start) / n * 1e9:.0f} ns per call with evictions")
+
+    print(square_memoize_all.cache_info())
+
+    # A thundering herd of identical calls triggers a single backend call
+    @memoize(ttl=1)
+    def slow_lookup(user_id: int) -> str:
+        time.sleep(0.1)
+        return f"user-{user_id}"
+
+    with ThreadPoolExecutor(max_workers=50) as executor:
+        list(executor.map(slow_lookup, [42] * 50))
+    print(f"50 threads: {slow_lookup.cache_info()}")
+
+    @memoize(ttl=1)
+    async def slow_fetch(user_id: int) -> str:
+        await asyncio.sleep(0.1)
+        return f"user-{user_id}"
+
+    async def herd() -> None:
+        await asyncio.gather(*(slow_fetch(42) for _ in range(1_000)))
+
+    asyncio.run(herd())
+    print(f"1000 tasks: {slow_fetch.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
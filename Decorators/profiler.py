@@ -0,0 +1,339 @@
+"""
+Custom module for a profiling decorator.  Where simple_timer and timed measure how long a call
+took, profiled shows where the time and memory inside it went: cProfile and tracemalloc capture
+decorated calls (or every Nth one), aggregated per function and dumped as pstats files, folded
+stacks for flame graphs, and allocation summaries.  Profiling is off unless switched on with the
+PROFILE_DECORATOR environment variable or set_profiling(), and costs one flag check while off.
+
+Class(es):
+    None
+
+Function(s):
+    set_profiling(bool) -> None
+    profiled(function, int, bool) -> function
+    profile_stats(function) -> pstats.Stats
+    dump_profiles(str) -> list[str]
+    main() -> None
+"""
+
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections import Counter
+from functools import wraps
+from typing import Optional
+
+# Decorated functions run unprofiled while this is False
+PROFILING_ENABLED = os.environ.get("PROFILE_DECORATOR", "") not in ("", "0")
+
+# Number of frames kept per allocation traceback when memory profiling
+TRACEMALLOC_FRAMES = 10
+
+
+class _FunctionProfile:
+    """
+    Profiles aggregated over every captured call of one decorated function.
+    """
+
+    __slots__ = ("name", "profile", "calls", "memory", "peak", "lock")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        # Net bytes allocated per source line, summed over captured calls
+        self.memory: Counter = Counter()
+        self.peak = 0
+        # Held while a call is captured: cProfile can only profile one call at a time
+        self.lock = threading.Lock()
+
+
+# Every profiled function's aggregate, by qualified name
+_PROFILES: dict[str, _FunctionProfile] = {}
+
+
+def set_profiling(enabled: bool) -> None:
+    """
+    Switch profiling of decorated functions on or off.
+
+    Args:
+        enabled (bool): Profile decorated calls
+    """
+
+    global PROFILING_ENABLED  # pylint: disable=W0603
+
+    PROFILING_ENABLED = enabled
+
+
+def _capture(aggregate: _FunctionProfile, memory: bool, function, args: tuple, kwargs: dict):
+    """
+    Run one call under cProfile, and tracemalloc if memory is set, adding the results to the
+    function's aggregate.  Calls made while another call or profiler is already capturing this
+    thread - nested or recursive decorated calls - run as they are, since cProfile can't nest and
+    the outer capture records them anyway.
+    """
+
+    if sys.getprofile() is not None or not aggregate.lock.acquire(blocking=False):
+        return function(*args, **kwargs)
+
+    started_tracing = False
+    try:
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                started_tracing = True
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start_size = tracemalloc.get_traced_memory()[0]
+
+        aggregate.profile.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            aggregate.profile.disable()
+            aggregate.calls += 1
+
+            if memory:
+                peak = tracemalloc.get_traced_memory()[1] - start_size
+                aggregate.peak = max(aggregate.peak, peak)
+                after = tracemalloc.take_snapshot()
+                for stat in after.compare_to(before, "lineno"):
+                    frame = stat.traceback[0]
+                    aggregate.memory[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        aggregate.lock.release()
+
+
+def profiled(function=None, every: int = 1, memory: bool = False):
+    """
+    Decorator capturing cProfile stats, and optionally tracemalloc allocations, for calls of the
+    decorated function while profiling is switched on.  Can be used bare (@profiled) or with
+    arguments (@profiled(every=100, memory=True)).  Results are aggregated across calls; read
+    them with profile_stats() or write them out with dump_profiles(), which also runs at exit
+    when the PROFILE_DIR environment variable names a directory.
+
+    Args:
+        function (function): Function to be profiled
+        every (int, optional): Capture one call in every. Defaults to 1.
+        memory (bool, optional): Also record net allocations per source line and the peak, which
+            snapshots the heap twice per captured call. Defaults to False.
+    """
+
+    if function is None:
+        return lambda function: profiled(function, every, memory)
+
+    name = f"{function.__module__}.{function.__qualname__}"
+    aggregate = _PROFILES.get(name)
+    if aggregate is None:
+        aggregate = _PROFILES[name] = _FunctionProfile(name)
+    countdown = every
+
+    @wraps(function)
+    def wrapper_func(*args, **kwargs):
+        nonlocal countdown
+
+        if not PROFILING_ENABLED:
+            return function(*args, **kwargs)
+
+        countdown -= 1
+        if countdown:
+            return function(*args, **kwargs)
+        countdown = every
+
+        return _capture(aggregate, memory, function, args, kwargs)
+
+    return wrapper_func
+
+
+def profile_stats(function) -> pstats.Stats:
+    """
+    Aggregated cProfile stats of a profiled function.
+
+    Args:
+        function (function): Decorated function
+
+    Raises:
+        ValueError: function has not captured any calls
+
+    Returns:
+        pstats.Stats: The stats, for print_stats(), sort_stats() and so on
+    """
+
+    aggregate = _PROFILES[f"{function.__module__}.{function.__qualname__}"]
+    if not aggregate.calls:
+        raise ValueError(f"No profiled calls of {aggregate.name}")
+
+    return pstats.Stats(aggregate.profile)
+
+
+def _folded_stacks(stats: pstats.Stats, max_depth: int = 64) -> list[str]:
+    """
+    Convert cProfile stats to the folded stack format read by flamegraph.pl and speedscope.
+    cProfile only records caller/callee pairs, not whole stacks, so a function's time is split
+    among its callers in proportion to the time each call edge took - an approximation that is
+    exact for functions with a single caller.
+
+    Args:
+        stats (pstats.Stats): Stats to convert
+        max_depth (int, optional): Deepest stack followed. Defaults to 64.
+
+    Returns:
+        list[str]: "frame;frame;frame microseconds" lines
+    """
+
+    entries = stats.stats  # type: ignore # (file, line, name) -> (cc, nc, tt, ct, callers)
+    callees: dict[tuple, list[tuple]] = {key: [] for key in entries}
+    for key, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            if caller in callees:
+                callees[caller].append(key)
+
+    def label(key: tuple) -> str:
+        filename, line, function_name = key
+        return f"{function_name} ({os.path.basename(filename)}:{line})"
+
+    lines: Counter = Counter()
+
+    def visit(key: tuple, stack: list[tuple], fraction: float) -> None:
+        _, _, tottime, _, _ = entries[key]
+        frames = ";".join(label(frame) for frame in stack)
+        lines[frames] += tottime * fraction * 1e6
+        if len(stack) >= max_depth:
+            return
+        for callee in callees[key]:
+            if callee in stack:  # Recursion - its time is already counted on this path
+                continue
+            callee_cumtime = entries[callee][3]
+            edge_cumtime = entries[callee][4][key][3]
+            if callee_cumtime > 0:
+                visit(callee, stack + [callee], fraction * edge_cumtime / callee_cumtime)
+
+    roots = [
+        key
+        for key, entry in entries.items()
+        if not any(caller in entries for caller in entry[4])
+        and "_lsprof.Profiler" not in key[2]  # The profiler's own disable() call
+    ]
+    for root in roots:
+        visit(root, [root], 1.0)
+
+    return [f"{frames} {round(value)}" for frames, value in lines.items() if round(value) > 0]
+
+
+def dump_profiles(directory: str) -> list[str]:
+    """
+    Write every profiled function's results to directory: <name>.pstats (load with pstats or
+    snakeviz), <name>.folded (feed to flamegraph.pl or speedscope) and, for memory profiles,
+    <name>.memory.txt.
+
+    Args:
+        directory (str): Output directory, created if needed
+
+    Returns:
+        list[str]: Paths written
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+
+    for name, aggregate in _PROFILES.items():
+        if not aggregate.calls:
+            continue
+        base = os.path.join(directory, name.replace("<", "").replace(">", ""))
+
+        with aggregate.lock:
+            aggregate.profile.dump_stats(f"{base}.pstats")
+            stats = pstats.Stats(aggregate.profile, stream=io.StringIO())
+        paths.append(f"{base}.pstats")
+
+        with open(f"{base}.folded", "w", encoding="utf-8") as file:
+            file.write("\n".join(_folded_stacks(stats)) + "\n")
+        paths.append(f"{base}.folded")
+
+        if aggregate.memory:
+            with open(f"{base}.memory.txt", "w", encoding="utf-8") as file:
+                file.write(f"{aggregate.calls} calls, peak {aggregate.peak} bytes\n")
+                for line, size in aggregate.memory.most_common(25):
+                    file.write(f"{size:>12} bytes  {line}\n")
+            paths.append(f"{base}.memory.txt")
+
+    return paths
+
+
+def _dump_at_exit() -> None:
+    directory: Optional[str] = os.environ.get("PROFILE_DIR")
+    if directory and _PROFILES:
+        dump_profiles(directory)
+
+
+atexit.register(_dump_at_exit)
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    import time  # pylint: disable=C0415
+
+    def parse(line: str) -> list[int]:
+        return [int(field) for field in line.split(",")]
+
+    def total(rows: list[list[int]]) -> int:
+        return sum(sum(row) for row in rows)
+
+    @profiled(every=10, memory=True)
+    def process(lines: list[str]) -> int:
+        return total([parse(line) for line in lines])
+
+    lines = [",".join(str(i + j) for j in range(20)) for i in range(2_000)]
+    calls = 200
+
+    for enabled in (False, True):
+        set_profiling(enabled)
+        start = time.perf_counter()
+        for _ in range(calls):
+            process(lines)
+        end = time.perf_counter()
+        state = "on" if enabled else "off"
+        print(f"Profiling {state}: {(end - start) / calls * 1e3:.3f} ms per call")
+
+    profile_stats(process).sort_stats("cumulative").print_stats(5)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for path in dump_profiles(directory):
+            print(f"Wrote {os.path.basename(path)}: {os.path.getsize(path)} bytes")
+            if path.endswith(".folded"):
+                with open(path, encoding="utf-8") as file:
+                    print(file.read())
+
+    # Overhead while off: one flag check on top of the wrapper call
+    set_profiling(False)
+
+    def noop():
+        pass
+
+    for name, function in (("undecorated", noop), ("profiled, off", profiled(noop))):
+        start = time.perf_counter()
+        for _ in range(1_000_000):
+            function()
+        end = time.perf_counter()
+        print(f"{name}: {(end - start) * 1e3:.0f} ns per call")
+
+
+if __name__ == "__main__":
+    main()
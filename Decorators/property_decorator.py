@@ -5,9 +5,11 @@ Classes:
     Employee
 
 Functions:
-    None
+    main() -> None
 """
 
+from cached_property import cached_property
+
 
 class Employee:
     """
@@ -18,7 +20,8 @@ class Employee:
         self.first = first
         self.last = last
 
-    @property  # Allow email method to be called like a attribute
+    # Like @property, but computed once and cached until first or last changes
+    @cached_property("first", "last")
     def email(self):
         """
         Return the email address of an employee.
@@ -28,7 +31,7 @@ class Employee:
         """
         return f"{self.first}.{self.last}@email.com"
 
-    @property  # Allow fullname method to be called like a attribute
+    @cached_property("first", "last")  # Allow fullname method to be called like a attribute
     def fullname(self):
         """
         Return the full name (first+last) of an employee.
@@ -60,26 +63,41 @@ class Employee:
         self.first, self.last = None, None
 
 
-emp1 = Employee("Craig", "Michaud")
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    emp1 = Employee("Craig", "Michaud")
+
+    # This will update first name of the instance and fullname() will
+    # get the new first name.  But, the email address isn't updated.
+    # We can correct this by creating an email method and decorating it
+    # with the @property.  This is a Pythonic way of implementing a
+    # getter function.
+    emp1.first = "Doug"
+
+    # This is an example of a setter method in Python
+    emp1.fullname = "Justin Michaud"
 
-# This will update first name of the instance and fullname() will
-# get the new first name.  But, the email address isn't updated.
-# We can correct this by creating an email method and decorating it
-# with the @property.  This is a Pythonic way of implementing a
-# getter function.
-emp1.first = "Doug"
+    print(emp1.first)
+    print(emp1.email)
+    print(emp1.fullname)
+    print()
 
-# This is an example of a setter method in Python
-emp1.fullname = "Justin Michaud"
+    # This is an example of a deleter method in Python
+    del emp1.fullname
+    print(f"First name: {emp1.first}")
+    print(f"Last name: {emp1.last}")
+    print(f"Full name: {emp1.fullname}")
+    print(f"Email: {emp1.email}")
 
-print(emp1.first)
-print(emp1.email)
-print(emp1.fullname)
-print()
 
-# This is an example of a deleter method in Python
-del emp1.fullname
-print(f"First name: {emp1.first}")
-print(f"Last name: {emp1.last}")
-print(f"Full name: {emp1.fullname}")
-print(f"Email: {emp1.email}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Custom module for a retry decorator.  Failed calls are retried with exponential backoff and full
+jitter - each wait is random between zero and the exponential bound, so clients that failed
+together don't all retry together - under a policy chosen by exception type, within an optional
+deadline for the whole call.  Works on regular and async functions.
+
+Class(es):
+    RetryPolicy
+    RetryStats
+
+Function(s):
+    retry(int, float, float, tuple, Optional[dict], Optional[float]) -> function
+    main() -> None
+"""
+
+import asyncio
+import contextlib
+import inspect
+import io
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How to retry after one type of exception.
+
+    Instance Attributes:
+        attempts (int): Most calls made in total, the first included
+        base_delay (float): Bound on the wait before the first retry, in seconds; it doubles
+            with each retry after that
+        max_delay (float): Cap on the bound, in seconds
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 10.0
+
+    def delay(self, retry_number: int) -> float:
+        """
+        Full jitter wait before a retry.
+
+        Args:
+            retry_number (int): 0 for the first retry, 1 for the second, ...
+
+        Returns:
+            float: Seconds to wait
+        """
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry_number))
+
+
+@dataclass(frozen=True)
+class RetryStats:
+    """
+    Snapshot of a retried function's statistics.
+
+    Instance Attributes:
+        calls (int): Calls of the decorated function
+        retries (int): Retries made across all calls
+        recovered (int): Calls that succeeded after at least one retry
+        failed (int): Calls that raised in the end
+        deadline_exceeded (int): Failed calls given up on because the next wait would pass the
+            deadline
+        total_wait (float): Seconds spent waiting between attempts
+    """
+
+    calls: int
+    retries: int
+    recovered: int
+    failed: int
+    deadline_exceeded: int
+    total_wait: float
+
+
+def retry(
+    attempts: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 10.0,
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+    policies: Optional[dict[type[BaseException], Optional[RetryPolicy]]] = None,
+    deadline: Optional[float] = None,
+):
+    """
+    Decorator retrying calls that raise, with exponential backoff and full jitter.  Parameterized
+    like prefix_decorator: @retry(attempts=5, deadline=2.0).
+
+    An exception's policy is the entry in policies for the closest class in its MRO - None there
+    means never retry it - or, failing that, the default policy built from attempts, base_delay
+    and max_delay if it is an instance of retry_on.  Anything else is raised straight away.  When
+    the next wait would end past deadline seconds after the call started, the last exception is
+    raised rather than waiting.  The decorated function gains retry_stats().
+
+    Args:
+        attempts (int): Most calls made in total by default. Defaults to 3.
+        base_delay (float): Default bound on the first wait, in seconds. Defaults to 0.1.
+        max_delay (float): Default cap on the waits, in seconds. Defaults to 10.0.
+        retry_on (tuple): Exception types retried under the default policy. Defaults to
+            (Exception,).
+        policies (Optional[dict]): Policies by exception type, overriding the default. Defaults
+            to None.
+        deadline (Optional[float]): Time budget per call in seconds, None for none. Defaults to
+            None.
+    """
+
+    default = RetryPolicy(attempts, base_delay, max_delay)
+    policies = dict(policies or {})
+
+    def policy_for(error: BaseException) -> Optional[RetryPolicy]:
+        for cls in type(error).__mro__:
+            if cls in policies:
+                return policies[cls]
+        return default if isinstance(error, retry_on) else None
+
+    def decorator_func(function):
+        lock = threading.Lock()
+        counts = {"calls": 0, "retries": 0, "recovered": 0, "failed": 0, "deadline_exceeded": 0}
+        total_wait = 0.0
+
+        def next_wait(error: BaseException, failures: int, started: float) -> Optional[float]:
+            """
+            Decide what to do after a call's failures-th failure: the seconds to wait before
+            retrying, or None to raise error.
+            """
+
+            nonlocal total_wait
+
+            policy = policy_for(error)
+            if policy is None or failures >= policy.attempts:
+                with lock:
+                    counts["calls"] += 1
+                    counts["failed"] += 1
+                return None
+
+            wait = policy.delay(failures - 1)
+            if deadline is not None and time.monotonic() + wait - started > deadline:
+                with lock:
+                    counts["calls"] += 1
+                    counts["failed"] += 1
+                    counts["deadline_exceeded"] += 1
+                return None
+
+            with lock:
+                counts["retries"] += 1
+                total_wait += wait
+            return wait
+
+        def succeeded(failures: int) -> None:
+            with lock:
+                counts["calls"] += 1
+                if failures:
+                    counts["recovered"] += 1
+
+        if inspect.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def wrapper_func(*args, **kwargs):
+                started = time.monotonic()
+                failures = 0
+                while True:
+                    try:
+                        result = await function(*args, **kwargs)
+                    except BaseException as error:  # pylint: disable=W0703
+                        failures += 1
+                        wait = next_wait(error, failures, started)
+                        if wait is None:
+                            raise
+                        await asyncio.sleep(wait)
+                    else:
+                        succeeded(failures)
+                        return result
+
+        else:
+
+            @wraps(function)
+            def wrapper_func(*args, **kwargs):
+                started = time.monotonic()
+                failures = 0
+                while True:
+                    try:
+                        result = function(*args, **kwargs)
+                    except BaseException as error:  # pylint: disable=W0703
+                        failures += 1
+                        wait = next_wait(error, failures, started)
+                        if wait is None:
+                            raise
+                        time.sleep(wait)
+                    else:
+                        succeeded(failures)
+                        return result
+
+        def retry_stats() -> RetryStats:
+            with lock:
+                return RetryStats(**counts, total_wait=total_wait)
+
+        wrapper_func.retry_stats = retry_stats
+
+        return wrapper_func
+
+    return decorator_func
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    # The point-of-sale system lives in a sibling directory and is written as a package script
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Classes" / "pos"))
+    # pylint: disable=C0415
+    from pos_system.payment import PaymentServiceConnectionError, StripePaymentProcessor
+
+    random.seed(7)
+    connection_retry = RetryPolicy(attempts=6, base_delay=0.01, max_delay=0.2)
+
+    class FlakyProcessor(StripePaymentProcessor):
+        """
+        Payment processor whose connection drops on 30% of calls.
+        """
+
+        @retry(policies={PaymentServiceConnectionError: connection_retry}, deadline=0.5)
+        def connect_to_service(self, url: str) -> None:
+            if random.random() < 0.3:
+                raise PaymentServiceConnectionError(f"Couldn't reach {url}")
+            super().connect_to_service(url)
+
+        @retry(policies={PaymentServiceConnectionError: connection_retry, ValueError: None})
+        def process_payment(self, reference: str, price: int) -> None:
+            if price <= 0:
+                raise ValueError(f"Invalid price {price}")  # Never worth retrying
+            if not self.connected:
+                self.connect_to_service("https://api.stripe.com/v2")
+            if random.random() < 0.3:
+                self.connected = False  # Connection dropped mid-payment
+            super().process_payment(reference, price)
+
+    processor = FlakyProcessor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.connect_to_service("https://api.stripe.com/v2")
+        for reference in range(200):
+            processor.process_payment(f"ORDER{reference}", 1_000)
+
+    try:
+        processor.process_payment("ORDER-BAD", 0)
+    except ValueError as error:
+        print(f"Not retried: {error!r}")
+
+    print(f"connect_to_service: {FlakyProcessor.connect_to_service.retry_stats()}")
+    print(f"process_payment: {FlakyProcessor.process_payment.retry_stats()}")
+
+    # Async calls, with a deadline too short for every call to recover
+    @retry(attempts=10, base_delay=0.05, deadline=0.1)
+    async def fetch(user_id: int) -> str:
+        await asyncio.sleep(0.01)
+        if random.random() < 0.5:
+            raise ConnectionError(f"Dropped fetching user {user_id}")
+        return f"user-{user_id}"
+
+    async def fetch_many() -> list:
+        return await asyncio.gather(*(fetch(i) for i in range(100)), return_exceptions=True)
+
+    results = asyncio.run(fetch_many())
+    print(f"fetch: {sum(isinstance(result, str) for result in results)}/100 fetched")
+    print(f"fetch: {fetch.retry_stats()}")
+
+
+if __name__ == "__main__":
+    main()
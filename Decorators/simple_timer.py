@@ -1,17 +1,35 @@
 """
-Custom module for timing decorators.
+Custom module for timing decorators.  simple_timer prints how long each call took; timed records
+call durations into per-function histograms for hot code, where printing every call would both
+flood the output and distort the measurements.
 
 Class(es):
-    None
+    TimingStats
+    LatencyHistogram
 
 Function(s):
     simple_timer(function) -> function
+    timed(function, int) -> function
+    timing_stats() -> list[TimingStats]
+    timing_report() -> str
+    export_timings(Optional[str]) -> str
+    reset_timings() -> None
     simple_add(int, int) -> int
+    main() -> None
 """
 
+import json
+from dataclasses import asdict, dataclass
 from functools import reduce, wraps
 from operator import mul
-from time import time as timer
+from time import perf_counter as timer
+from time import perf_counter_ns
+from typing import Optional
+
+# Histogram buckets: exact below 2^7 ns, then 64 buckets per power of two (under 1.6% error)
+_SUB_BUCKET_BITS = 6
+_EXACT_LIMIT = 1 << (_SUB_BUCKET_BITS + 1)
+_BUCKETS = (64 - _SUB_BUCKET_BITS) << _SUB_BUCKET_BITS
 
 
 def simple_timer(func):
@@ -36,6 +54,252 @@ def simple_timer(func):
     return time_wrap
 
 
+@dataclass(frozen=True)
+class TimingStats:
+    """
+    Summary of a timed function's call durations, in nanoseconds.
+    """
+
+    name: str
+    calls: int
+    count: int
+    mean: float
+    p50: int
+    p95: int
+    p99: int
+    max: int
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in nanoseconds: fixed memory however many values are
+    recorded, with percentiles accurate to within 1.6%.
+
+    Recording takes no lock, which would cost more than the rest of record put together; with
+    many threads timing the same function, an occasional count may be lost to a race.
+
+    Instance Attributes:
+        name (str): Name of the timed function
+        count (int): Durations recorded
+        skipped (int): Calls not timed because of sampling
+        total (int): Sum of the durations recorded
+        max (int): Longest duration recorded
+        buckets (list[int]): Count of durations per bucket
+    """
+
+    __slots__ = ("name", "count", "skipped", "total", "max", "buckets")
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            name (str): Name of the timed function
+        """
+
+        self.name = name
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget every recorded duration.
+        """
+
+        self.count = self.skipped = self.total = self.max = 0
+        self.buckets = [0] * _BUCKETS
+
+    def record(self, duration: int) -> None:
+        """
+        Add a duration to the histogram.
+
+        Args:
+            duration (int): Duration in nanoseconds
+        """
+
+        if duration < _EXACT_LIMIT:
+            self.buckets[duration] += 1
+        else:
+            shift = duration.bit_length() - _SUB_BUCKET_BITS - 1
+            self.buckets[(shift << _SUB_BUCKET_BITS) + (duration >> shift)] += 1
+
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, q: float) -> int:
+        """
+        Estimate a percentile of the recorded durations.
+
+        Args:
+            q (float): Percentile, in [0, 100]
+
+        Returns:
+            int: Duration in nanoseconds, the midpoint of the bucket holding the percentile
+        """
+
+        rank = max(1, round(self.count * q / 100))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                break
+        else:
+            return self.max
+
+        if index < _EXACT_LIMIT:
+            return index
+        shift = (index >> _SUB_BUCKET_BITS) - 1
+        value = ((index - (shift << _SUB_BUCKET_BITS)) << shift) + (1 << shift) // 2
+
+        return min(value, self.max)
+
+    def stats(self) -> TimingStats:
+        """
+        Summarize the histogram.
+
+        Returns:
+            TimingStats: Count, mean, percentiles and max
+        """
+
+        return TimingStats(
+            name=self.name,
+            calls=self.count + self.skipped,
+            count=self.count,
+            mean=self.total / self.count if self.count else 0.0,
+            p50=self.percentile(50),
+            p95=self.percentile(95),
+            p99=self.percentile(99),
+            max=self.max,
+        )
+
+
+# Every timed function's histogram, by qualified name
+_HISTOGRAMS: dict[str, LatencyHistogram] = {}
+
+
+def timed(function=None, every: int = 1):
+    """
+    Decorator that records call durations with perf_counter_ns into a histogram per function,
+    rather than printing them.  Can be used bare (@timed) or with arguments (@timed(every=100)).
+    Read the results with timing_stats(), timing_report() or export_timings().
+
+    With every > 1 only one call in every is timed, leaving the others an integer check away
+    from an undecorated call - for functions hot enough that even reading the clock shows.
+
+    Calls that raise are timed too.  Like any wrapper made with functools.wraps, it can sit
+    anywhere in a stack of decorators such as @simple_timer and @my_logger; it times whatever
+    it wraps.
+
+    Args:
+        function (function): Function to be timed
+        every (int, optional): Time one call in every. Defaults to 1.
+    """
+
+    if function is None:
+        return lambda function: timed(function, every)
+
+    name = f"{function.__module__}.{function.__qualname__}"
+    histogram = _HISTOGRAMS.get(name)
+    if histogram is None:
+        histogram = _HISTOGRAMS[name] = LatencyHistogram(name)
+    record = histogram.record
+
+    if every == 1:
+
+        @wraps(function)
+        def time_wrap(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start)
+
+    else:
+        countdown = every
+
+        @wraps(function)
+        def time_wrap(*args, **kwargs):
+            nonlocal countdown
+
+            countdown -= 1
+            if countdown:
+                return function(*args, **kwargs)
+
+            countdown = every
+            histogram.skipped += every - 1
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start)
+
+    time_wrap.timing_stats = histogram.stats
+
+    return time_wrap
+
+
+def timing_stats() -> list[TimingStats]:
+    """
+    Summarize every timed function.
+
+    Returns:
+        list[TimingStats]: One summary per timed function, by name
+    """
+
+    return [_HISTOGRAMS[name].stats() for name in sorted(_HISTOGRAMS)]
+
+
+def timing_report() -> str:
+    """
+    Format every timed function's summary as a table, in microseconds.
+
+    Returns:
+        str: The table
+    """
+
+    lines = [
+        f"{'function':<40} {'calls':>10} {'timed':>10} {'mean':>10} "
+        f"{'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"
+    ]
+    for stats in timing_stats():
+        lines.append(
+            f"{stats.name:<40} {stats.calls:>10} {stats.count:>10} {stats.mean / 1e3:>10.3f} "
+            f"{stats.p50 / 1e3:>10.3f} {stats.p95 / 1e3:>10.3f} {stats.p99 / 1e3:>10.3f} "
+            f"{stats.max / 1e3:>10.3f}"
+        )
+
+    return "\n".join(lines)
+
+
+def export_timings(path: Optional[str] = None) -> str:
+    """
+    Export every timed function's summary as JSON.
+
+    Args:
+        path (Optional[str]): Also write the JSON to this file. Defaults to None.
+
+    Returns:
+        str: The JSON
+    """
+
+    exported = json.dumps([asdict(stats) for stats in timing_stats()], indent=2)
+    if path is not None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(exported)
+
+    return exported
+
+
+def reset_timings() -> None:
+    """
+    Clear every timed function's histogram.
+    """
+
+    for histogram in _HISTOGRAMS.values():
+        histogram.reset()
+
+
 @simple_timer
 def simple_add(n: int) -> int:
     """
@@ -82,6 +346,40 @@ def main():
 
     print(f"Product of numbers from to 10: {simple_multiply(10)}")
 
+    # Per-call overhead of each timer on a function that does nothing
+    calls = 1_000_000
+
+    def noop():
+        pass
+
+    @timed
+    def timed_noop():
+        pass
+
+    @timed(every=100)
+    def sampled_noop():
+        pass
+
+    for name, function in (
+        ("undecorated", noop),
+        ("timed", timed_noop),
+        ("timed(every=100)", sampled_noop),
+    ):
+        start = perf_counter_ns()
+        for _ in range(calls):
+            function()
+        end = perf_counter_ns()
+        print(f"{name}: {(end - start) / calls:.0f} ns per call")
+
+    @timed
+    def sort_copy(values: list) -> list:
+        return sorted(values)
+
+    for size in range(1, 20_000, 7):
+        sort_copy(list(range(size, 0, -1)))
+
+    print(timing_report())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,186 @@
+"""
+Custom module for deferring heavy imports until they are used.  Importing numba costs ~0.4
+seconds and numpy ~0.1, paid by every script that imports a module needing them somewhere, even
+when it only wants a helper that doesn't.  lazy_import returns a module that is loaded on first
+attribute access, and lazy_jit defers importing numba and compiling a function until its first
+call.
+
+Class(es):
+    LazyJit
+
+Function(s):
+    lazy_import(str) -> ModuleType
+    lazy_jit(function, **options) -> LazyJit
+    main() -> None
+"""
+
+import importlib.util
+import sys
+import threading
+from functools import update_wrapper
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module lazily: it is registered in sys.modules straight away, but only executed on
+    first attribute access.  Later imports of the module, lazy or not, get the same object, so
+    `np = lazy_import("numpy")` followed by numba's own `import numpy` loads it once.
+
+    Args:
+        name (str): Absolute module name, e.g. "numpy" or "pandas"
+
+    Raises:
+        ModuleNotFoundError: The module is not installed
+
+    Returns:
+        ModuleType: The module, loaded when first used
+    """
+
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    return module
+
+
+_REGISTERED = False
+
+
+def _register_with_numba() -> None:
+    """
+    Teach numba to type a LazyJit as its dispatcher, so compiled code can call one.  Runs once,
+    when the first LazyJit imports numba.
+    """
+
+    global _REGISTERED  # pylint: disable=W0603
+
+    if _REGISTERED:
+        return
+
+    from numba.core import types  # type: ignore # pylint: disable=C0415
+    from numba.extending import typeof_impl  # type: ignore # pylint: disable=C0415
+
+    @typeof_impl.register(LazyJit)
+    def _typeof_lazy_jit(value: "LazyJit", context: Any) -> Any:  # pylint: disable=W0613
+        return types.Dispatcher(value.dispatcher)
+
+    _REGISTERED = True
+
+
+class LazyJit:
+    """
+    Function compiled with numba.jit on its first call, which is also when numba is imported.
+    After that, calls go to the numba dispatcher through one extra Python call, which is
+    negligible for the loops worth compiling.  Compiled functions calling a LazyJit call its
+    dispatcher directly, so helpers can be lazy too.
+
+    Instance Attributes:
+        py_func (Callable): The function to be compiled
+        options (dict): Keyword arguments for numba.jit
+    """
+
+    def __init__(self, py_func: Callable, options: dict[str, Any]) -> None:
+        self.py_func = py_func
+        self.options = options
+        self._dispatcher: Optional[Callable] = None
+        self._lock = threading.Lock()
+        update_wrapper(self, py_func)
+
+    @property
+    def dispatcher(self) -> Callable:
+        """
+        The numba dispatcher, importing numba and creating it if needed.  Compilation itself
+        happens on its first call for each new argument type signature.
+        """
+
+        if self._dispatcher is None:
+            with self._lock:
+                if self._dispatcher is None:
+                    import numba  # type: ignore # pylint: disable=C0415
+
+                    _register_with_numba()
+                    self._dispatcher = numba.jit(**self.options)(self.py_func)
+
+        return self._dispatcher
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.dispatcher(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "pending" if self._dispatcher is None else "created"
+        return f"<LazyJit {self.__qualname__} ({state})>"
+
+
+def lazy_jit(function: Optional[Callable] = None, **options: Any):
+    """
+    Decorator like numba.jit that imports numba and compiles on the first call instead of at
+    decoration time.  Can be used bare (@lazy_jit) or with numba.jit's options
+    (@lazy_jit(nopython=True)).
+
+    Args:
+        function (Callable): Function to be compiled
+        **options (Any): Keyword arguments for numba.jit
+    """
+
+    if function is None:
+        return lambda function: LazyJit(function, options)
+
+    return LazyJit(function, options)
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    import time  # pylint: disable=C0415
+
+    start = time.perf_counter()
+    np = lazy_import("numpy")
+
+    @lazy_jit(nopython=True)
+    def total(values):
+        result = 0.0
+        for value in values:
+            result += value
+        return result
+
+    end = time.perf_counter()
+    print(f"Lazy numpy and lazy_jit: {(end - start) * 1e3:.1f} ms, {total!r}")
+
+    start = time.perf_counter()
+    values = np.arange(1_000_000, dtype=np.float64)
+    end = time.perf_counter()
+    print(f"First numpy use: {(end - start) * 1e3:.1f} ms")
+
+    start = time.perf_counter()
+    total(values)
+    end = time.perf_counter()
+    print(f"First call, importing numba and compiling: {(end - start) * 1e3:.1f} ms, {total!r}")
+
+    start = time.perf_counter()
+    total(values)
+    end = time.perf_counter()
+    print(f"Second call: {(end - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
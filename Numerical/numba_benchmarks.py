@@ -0,0 +1,559 @@
+"""
+Reproducible benchmarks comparing plain Python, NumPy and Numba versions of the numba_testing
+functions.  Each benchmark separates the one-off costs - importing numba, compiling for the
+argument types - from the steady state, runs untimed warmup calls, then times repeated calls with
+every random number generator reseeded so each run does the same work, and reports min, median,
+mean and standard deviation.  A scaling benchmark runs the parallel versions on 1..N threads, and
+another compares test_numpy's memory use and traffic with its allocation-free version.
+Results are written to JSON, along with the versions and machine they were measured on, for
+tracking regressions across commits.
+
+Class(es):
+    BenchmarkResult
+
+Function(s):
+    seed_all(int, bool) -> None
+    benchmark(str, Callable, Any, str, int, int, int) -> BenchmarkResult
+    run_benchmarks(list[int], list[int], int, int, int) -> list[BenchmarkResult]
+    thread_counts() -> list[int]
+    run_scaling(int, int, list[int], int, int, int) -> list[BenchmarkResult]
+    peak_memory(Callable, Any) -> int
+    run_inplace_comparison(list[int], int, int, int) -> list[BenchmarkResult]
+    environment(int, int, int) -> dict
+    write_results(str, dict, list[BenchmarkResult]) -> None
+    main() -> None
+"""
+
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from typing import Any, Callable, Optional
+
+from lazy_imports import LazyJit, lazy_import, lazy_jit
+from numba_testing import (
+    synthetic_ohlcv,
+    test,
+    test_numba,
+    test_numba_parallel,
+    test_numpy,
+    test_numpy_inplace,
+    test_numpy_numba,
+    test_numpy_numba_parallel,
+    test_pandas,
+    test_pandas_numba,
+)
+
+np = lazy_import("numpy")
+
+# Sizes swept by default; numba_testing.main() runs n = 10_000_000 and p = 500 once
+N_VALUES = [10_000, 100_000, 1_000_000]
+P_VALUES = [50, 100, 200]
+INPLACE_P_VALUES = [100, 200, 500]
+SEED = 42
+
+# Functions benchmarked, by the kind of argument they take
+SCALAR_FUNCTIONS = [("test", test), ("test_numba", test_numba)]
+ARRAY_FUNCTIONS = [("test_numpy", test_numpy), ("test_numpy_numba", test_numpy_numba)]
+DATAFRAME_FUNCTIONS = [("test_pandas", test_pandas), ("test_pandas_numba", test_pandas_numba)]
+
+# Sizes of the scaling benchmark, and the parallel functions it runs with their serial versions
+SCALING_N = 10_000_000
+SCALING_P = 200
+PARALLEL_FUNCTIONS = [
+    ("test_numba_parallel", test_numba_parallel, "test_numba", test_numba),
+    ("test_numpy_numba_parallel", test_numpy_numba_parallel, "test_numpy_numba", test_numpy_numba),
+]
+
+# test_numpy and its allocation-free version, with the passes over a p x p array each makes per
+# iteration - reading or writing one array is one pass.  Both make 14: writing a and b, reading
+# and writing for each square and the square root, and reading two and writing one for the sum
+# and for c +=.  What the in-place version saves is the allocations, and with them the page
+# faults and cache misses of touching fresh memory.
+INPLACE_FUNCTIONS = [("test_numpy", test_numpy, 14), ("test_numpy_inplace", test_numpy_inplace, 14)]
+
+# Where main() writes the results, overridden by the BENCHMARK_OUTPUT environment variable
+OUTPUT = os.environ.get("BENCHMARK_OUTPUT", "numba_benchmarks.json")
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """
+    Timings of one function for one argument.  Times are in seconds.
+
+    Instance Attributes:
+        name (str): Function name
+        parameter (str): Argument description, e.g. "n=100000"
+        import_time (Optional[float]): Importing numba and creating the dispatcher, for Numba
+            functions whose first use this was
+        compile_time (Optional[float]): Compiling for the argument's types, for Numba functions
+        warmup (int): Untimed calls made before timing
+        times (list[float]): Time of each timed call
+        minimum (float): Fastest call
+        median (float): Median call
+        mean (float): Mean call
+        stdev (float): Standard deviation of the calls, 0 for a single call
+        checksum (float): Sum of the result, identical across runs with the same seed
+        error (Optional[str]): Why the benchmark couldn't run, in which case the times are empty
+        threads (Optional[int]): Threads a parallel function ran on
+        peak_memory (Optional[int]): Most bytes allocated at once during a call, for the
+            allocation comparison
+        bytes_moved (Optional[int]): Bytes read and written by a call, estimated from the passes
+            over its arrays, for the allocation comparison
+    """
+
+    name: str
+    parameter: str
+    import_time: Optional[float]
+    compile_time: Optional[float]
+    warmup: int
+    times: list[float]
+    minimum: float
+    median: float
+    mean: float
+    stdev: float
+    checksum: float
+    error: Optional[str] = None
+    threads: Optional[int] = None
+    peak_memory: Optional[int] = None
+    bytes_moved: Optional[int] = None
+
+
+@lazy_jit(nopython=True)
+def _seed_numba(seed: int) -> None:
+    """
+    Seed Numba's random number generators, which are separate from Python's and NumPy's and can
+    only be seeded from compiled code.
+    """
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def seed_all(seed: int, numba: bool = True) -> None:
+    """
+    Seed every random number generator the benchmarked functions use: Python's, NumPy's global
+    one, and Numba's.
+
+    Args:
+        seed (int): Random seed
+        numba (bool, optional): Also seed Numba's, which imports numba. Defaults to True.
+    """
+
+    random.seed(seed)
+    np.random.seed(seed)
+    if numba:
+        _seed_numba(seed)
+
+
+def _checksum(result: Any) -> float:
+    """
+    Reduce a benchmarked function's result to one float.
+    """
+
+    if isinstance(result, float):
+        return result
+    return float(np.asarray(result, dtype=np.float64).sum())
+
+
+def benchmark(
+    name: str,
+    function: Callable,
+    argument: Any,
+    parameter: str,
+    repeats: int = 5,
+    warmup: int = 1,
+    seed: int = SEED,
+) -> BenchmarkResult:
+    """
+    Benchmark one function for one argument.  A Numba function (a LazyJit) first has numba
+    imported, if that hasn't happened yet, and is compiled for the argument's types, each timed
+    separately; the warmup calls and every timed call then start from the same seed.
+
+    Args:
+        name (str): Function name to report
+        function (Callable): Function to benchmark, called with argument
+        argument (Any): Argument to call it with
+        parameter (str): Argument description to report
+        repeats (int, optional): Timed calls. Defaults to 5.
+        warmup (int, optional): Untimed calls before them. Defaults to 1.
+        seed (int, optional): Random seed. Defaults to SEED.
+
+    Returns:
+        BenchmarkResult: The timings
+    """
+
+    jitted = isinstance(function, LazyJit)
+
+    try:
+        import_time = compile_time = None
+        if jitted:
+            start = time.perf_counter()
+            dispatcher = function.dispatcher
+            end = time.perf_counter()
+            import_time = end - start
+
+            # Typed the way a call types it: pyobject for object mode arguments like DataFrames
+            start = time.perf_counter()
+            dispatcher.compile((dispatcher.typeof_pyval(argument),))
+            end = time.perf_counter()
+            compile_time = end - start
+
+        for _ in range(warmup):
+            seed_all(seed, jitted)
+            function(argument)
+
+        times = []
+        checksums = set()
+        for _ in range(repeats):
+            seed_all(seed, jitted)
+            start = time.perf_counter()
+            result = function(argument)
+            end = time.perf_counter()
+            times.append(end - start)
+            checksums.add(_checksum(result))
+    except Exception as error:  # pylint: disable=W0703
+        return BenchmarkResult(
+            name=name,
+            parameter=parameter,
+            import_time=None,
+            compile_time=None,
+            warmup=warmup,
+            times=[],
+            minimum=math.nan,
+            median=math.nan,
+            mean=math.nan,
+            stdev=math.nan,
+            checksum=math.nan,
+            error=f"{type(error).__name__}: {error}",
+        )
+
+    if len(checksums) > 1:
+        raise RuntimeError(f"{name}({parameter}) gave different results for the same seed")
+
+    return BenchmarkResult(
+        name=name,
+        parameter=parameter,
+        import_time=import_time,
+        compile_time=compile_time,
+        warmup=warmup,
+        times=times,
+        minimum=min(times),
+        median=statistics.median(times),
+        mean=statistics.mean(times),
+        stdev=statistics.stdev(times) if len(times) > 1 else 0.0,
+        checksum=checksums.pop(),
+    )
+
+
+def run_benchmarks(
+    n_values: list[int],
+    p_values: list[int],
+    repeats: int = 5,
+    warmup: int = 1,
+    seed: int = SEED,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark the scalar loops (test, test_numba) for each n, the array loops (test_numpy,
+    test_numpy_numba) for each p, and the DataFrame functions on synthetic OHLCV data if pandas
+    is installed, printing each result as it completes.
+
+    Args:
+        n_values (list[int]): Iterations for the scalar loops
+        p_values (list[int]): Array sizes (p x p, p iterations) for the array loops
+        repeats (int, optional): Timed calls per benchmark. Defaults to 5.
+        warmup (int, optional): Untimed calls per benchmark. Defaults to 1.
+        seed (int, optional): Random seed, for the synthetic data too. Defaults to SEED.
+
+    Returns:
+        list[BenchmarkResult]: The results
+    """
+
+    cases: list[tuple[str, Callable, Any, str]] = []
+    for n in n_values:
+        cases += [(name, function, n, f"n={n}") for name, function in SCALAR_FUNCTIONS]
+    for p in p_values:
+        cases += [(name, function, p, f"p={p}") for name, function in ARRAY_FUNCTIONS]
+    if find_spec("pandas") is not None:
+        data = synthetic_ohlcv(seed=seed)
+        parameter = f"days={len(data)}"
+        cases += [(name, function, data, parameter) for name, function in DATAFRAME_FUNCTIONS]
+    else:
+        print("pandas not installed, skipping the DataFrame benchmarks")
+
+    results = []
+    for name, function, argument, parameter in cases:
+        result = benchmark(name, function, argument, parameter, repeats, warmup, seed)
+        results.append(result)
+
+        if result.error is not None:
+            print(f"{name}({parameter}): failed, {result.error}")
+            continue
+        one_off = ""
+        if result.compile_time is not None:
+            one_off = f", compile {result.compile_time:.3f} s"
+        if result.import_time is not None and result.import_time > 0.001:
+            one_off += f", importing numba {result.import_time:.3f} s"
+        print(
+            f"{name}({parameter}): median {result.median:.5f} s, min {result.minimum:.5f} s,"
+            f" stdev {result.stdev:.5f} s{one_off}"
+        )
+
+    return results
+
+
+def thread_counts() -> list[int]:
+    """
+    Thread counts for the scaling benchmark: powers of two up to the number of threads Numba
+    can use, then that number.  Set the NUMBA_NUM_THREADS environment variable to change it.
+
+    Returns:
+        list[int]: Thread counts, ascending
+    """
+
+    import numba  # type: ignore # pylint: disable=C0415
+
+    most = numba.config.NUMBA_NUM_THREADS
+    counts = [1]
+    while counts[-1] * 2 < most:
+        counts.append(counts[-1] * 2)
+    if most > 1:
+        counts.append(most)
+
+    return counts
+
+
+def run_scaling(
+    n: int,
+    p: int,
+    threads: list[int],
+    repeats: int = 5,
+    warmup: int = 1,
+    seed: int = SEED,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark the parallel functions on each number of threads, with their serial versions for
+    comparison, printing the speedup over one thread and over the serial version.  The parallel
+    functions must give the same result on any number of threads.
+
+    Args:
+        n (int): Iterations for test_numba_parallel
+        p (int): Array size for test_numpy_numba_parallel
+        threads (list[int]): Thread counts to run on
+        repeats (int, optional): Timed calls per benchmark. Defaults to 5.
+        warmup (int, optional): Untimed calls per benchmark. Defaults to 1.
+        seed (int, optional): Random seed. Defaults to SEED.
+
+    Raises:
+        RuntimeError: A parallel function's result depended on the number of threads
+
+    Returns:
+        list[BenchmarkResult]: The results
+    """
+
+    results = []
+    for (name, function, serial_name, serial), (label, size) in zip(
+        PARALLEL_FUNCTIONS, (("n", n), ("p", p))
+    ):
+        baseline = benchmark(serial_name, serial, size, f"{label}={size}", repeats, warmup, seed)
+        results.append(baseline)
+        if baseline.error is not None:
+            print(f"{serial_name}({label}={size}): failed, {baseline.error}")
+        else:
+            print(f"{serial_name}({label}={size}): median {baseline.median:.5f} s, serial")
+
+        # The compiled code is the same for any size, so compile on a tiny one
+        start = time.perf_counter()
+        function(1, seed=seed, threads=1)
+        end = time.perf_counter()
+        compile_time = end - start
+
+        one_thread = None
+        for count in threads:
+            result = benchmark(
+                name,
+                partial(function, seed=seed, threads=count),
+                size,
+                f"{label}={size}",
+                repeats,
+                warmup,
+                seed,
+            )
+            result = replace(result, threads=count, compile_time=compile_time)
+            results.append(result)
+
+            # A failed run has a NaN checksum, which never equals anything - report its error
+            # rather than a spurious difference, and compare the others with the first success
+            if result.error is not None:
+                print(f"{name}({label}={size}, threads={count}): failed, {result.error}")
+                continue
+            if one_thread is None:
+                one_thread = result
+            elif result.checksum != one_thread.checksum:
+                raise RuntimeError(f"{name} gave a different result on {count} threads")
+
+            speedup = one_thread.median / result.median
+            print(
+                f"{name}({label}={size}, threads={count}): median {result.median:.5f} s, "
+                f"{speedup:.2f}x over {one_thread.threads} thread"
+                f"{'' if one_thread.threads == 1 else 's'} "
+                f"({speedup * one_thread.threads / count:.0%} efficiency), "
+                f"{baseline.median / result.median:.2f}x over {serial_name}"
+            )
+        print(f"{name}: compiled in {compile_time:.3f} s")
+
+    return results
+
+
+def peak_memory(function: Callable, argument: Any) -> int:
+    """
+    Peak memory allocated during one call, as seen by tracemalloc, which NumPy reports its array
+    buffers to.
+
+    Args:
+        function (Callable): Function to call
+        argument (Any): Argument to call it with
+
+    Returns:
+        int: Peak bytes allocated
+    """
+
+    tracemalloc.start()
+    try:
+        function(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def run_inplace_comparison(
+    p_values: list[int],
+    repeats: int = 5,
+    warmup: int = 1,
+    seed: int = SEED,
+) -> list[BenchmarkResult]:
+    """
+    Compare test_numpy with test_numpy_inplace for each p: time per call, peak memory, and
+    throughput as terms summed per second and estimated memory traffic per second.
+
+    Args:
+        p_values (list[int]): Array sizes (p x p, p iterations)
+        repeats (int, optional): Timed calls per benchmark. Defaults to 5.
+        warmup (int, optional): Untimed calls per benchmark. Defaults to 1.
+        seed (int, optional): Random seed. Defaults to SEED.
+
+    Returns:
+        list[BenchmarkResult]: The results
+    """
+
+    results = []
+    for p in p_values:
+        for name, function, passes in INPLACE_FUNCTIONS:
+            if function is test_numpy_inplace:
+                function = partial(test_numpy_inplace, seed=seed)
+
+            result = benchmark(name, function, p, f"p={p}", repeats, warmup, seed)
+            result = replace(
+                result,
+                peak_memory=peak_memory(function, p),
+                bytes_moved=passes * p * p * p * 8,
+            )
+            results.append(result)
+
+            print(
+                f"{name}(p={p}): median {result.median:.5f} s, "
+                f"peak {result.peak_memory / 2**20:.1f} MiB, "
+                f"{p**3 / result.median / 1e6:.0f} M terms/s, "
+                f"{result.bytes_moved / result.median / 1e9:.2f} GB/s"
+            )
+
+    return results
+
+
+def environment(seed: int, repeats: int, warmup: int) -> dict:
+    """
+    Describe what the benchmarks ran on and how, for comparing results between machines and
+    commits.
+
+    Args:
+        seed (int): Random seed used
+        repeats (int): Timed calls per benchmark
+        warmup (int): Untimed calls per benchmark
+
+    Returns:
+        dict: Versions, machine and settings
+    """
+
+    import numba  # type: ignore # pylint: disable=C0415
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numba_threads": numba.config.NUMBA_NUM_THREADS,
+        "seed": seed,
+        "repeats": repeats,
+        "warmup": warmup,
+    }
+
+
+def write_results(path: str, metadata: dict, results: list[BenchmarkResult]) -> None:
+    """
+    Write benchmark results as JSON: {"environment": {...}, "results": [{...}, ...]}.  NaN
+    timings of failed benchmarks are written as null.
+
+    Args:
+        path (str): File to write
+        metadata (dict): Output of environment()
+        results (list[BenchmarkResult]): Results to write
+    """
+
+    def clean(value: Any) -> Any:
+        return None if isinstance(value, float) and math.isnan(value) else value
+
+    document = {
+        "environment": metadata,
+        "results": [
+            {key: clean(value) for key, value in asdict(result).items()} for result in results
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2)
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    repeats, warmup = 5, 1
+    results = run_benchmarks(N_VALUES, P_VALUES, repeats, warmup, SEED)
+    results += run_inplace_comparison(INPLACE_P_VALUES, repeats, warmup, SEED)
+    results += run_scaling(SCALING_N, SCALING_P, thread_counts(), repeats, warmup, SEED)
+    write_results(OUTPUT, environment(SEED, repeats, warmup), results)
+    print(f"Wrote {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
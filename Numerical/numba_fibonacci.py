@@ -0,0 +1,215 @@
+"""
+Custom module for computing fixed-width Fibonacci sequences with Numba.  Values are written into
+preallocated uint64 NumPy arrays, either exactly (falling back to Python big ints once the terms
+no longer fit in 64 bits) or modulo p, which never overflows and scales to billions of terms.
+
+Class(es):
+    None
+
+Function(s):
+    fib_fill_uint64(np.array) -> int
+    fib_fill_mod(np.array, np.uint64, np.uint64, np.uint64) -> tuple
+    fib_sequence(int, Optional[int]) -> np.array
+    fib_mod_chunks(int, int, int, int) -> Iterator[np.array]
+    main() -> None
+"""
+
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+from numba import njit  # type: ignore
+
+UINT64_MAX = np.uint64(np.iinfo(np.uint64).max)
+
+
+@njit(cache=True)
+def fib_fill_uint64(out: npt.NDArray[np.uint64]) -> int:
+    """
+    Fill out with the Fibonacci sequence, stopping at the first term that overflows 64 bits.
+
+    Args:
+        out (np.array): Preallocated uint64 array to fill
+
+    Returns:
+        int: Number of terms written, len(out) unless the sequence overflowed
+    """
+
+    a = np.uint64(0)
+    b = np.uint64(1)
+
+    n = out.shape[0]
+
+    for i in range(n):
+        out[i] = a
+        if b > UINT64_MAX - a:
+            # a + b (the term two places on) won't fit, but b itself still does
+            if i + 1 < n:
+                out[i + 1] = b
+            return min(i + 2, n)
+        a, b = b, a + b
+
+    return n
+
+
+@njit(cache=True)
+def fib_fill_mod(
+    out: npt.NDArray[np.uint64], a: np.uint64, b: np.uint64, mod: np.uint64
+) -> tuple[np.uint64, np.uint64]:
+    """
+    Continue a Fibonacci sequence modulo mod into out, starting from the pair (a, b).
+
+    Args:
+        out (np.array): Preallocated uint64 array to fill
+        a (np.uint64): First term to write, already reduced modulo mod
+        b (np.uint64): Term after a, already reduced modulo mod
+        mod (np.uint64): Modulus, anywhere in [1, 2^64)
+
+    Returns:
+        tuple: The pair following the last term written, to continue the sequence from
+    """
+
+    for i in range(out.shape[0]):
+        out[i] = a
+        # a + b mod p without ever forming a + b, which could overflow for p > 2^63
+        c = a - (mod - b) if a >= mod - b else a + b
+        a, b = b, c
+
+    return a, b
+
+
+def _fib_pair_mod(n: int, mod: int) -> tuple[int, int]:
+    """
+    Fast-doubling (F(n) mod mod, F(n+1) mod mod) in Python ints, used to start a sequence at an
+    arbitrary index without needing 128-bit products inside the kernel.
+    """
+
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a) % mod, (a * a + b * b) % mod
+        if bit == "1":
+            a, b = b, (a + b) % mod
+
+    return a % mod, b % mod
+
+
+def fib_sequence(n: int, mod: Optional[int] = None) -> npt.NDArray:
+    """
+    Compute the first n Fibonacci numbers as a NumPy array.
+
+    Args:
+        n (int): Length of Fibonacci sequence to be computed
+        mod (Optional[int]): Reduce every term modulo mod, in [1, 2^64). Defaults to None.
+
+    Raises:
+        ValueError: n must be a positive integer and mod fit in 64 bits
+
+    Returns:
+        np.array: uint64 array, or an object array of Python ints if the exact sequence
+            overflows 64 bits (n > 94)
+    """
+
+    if n < 0:
+        raise ValueError(f"Expect positive integer, got {n}")
+
+    out = np.empty(n, dtype=np.uint64)
+
+    if mod is not None:
+        if not 1 <= mod <= int(UINT64_MAX):
+            raise ValueError(f"Expect modulus in [1, 2^64), got {mod}")
+        fib_fill_mod(out, np.uint64(0), np.uint64(1 % mod), np.uint64(mod))
+        return out
+
+    filled = fib_fill_uint64(out)
+    if filled == n:
+        return out
+
+    # Overflowed - carry on from the last two exact terms with Python big ints
+    result = np.empty(n, dtype=object)
+    result[:filled] = [int(value) for value in out[:filled]]
+    a, b = int(out[filled - 2]), int(out[filled - 1])
+    for i in range(filled, n):
+        a, b = b, a + b
+        result[i] = b
+
+    return result
+
+
+def fib_mod_chunks(
+    start: int, stop: int, mod: int, chunk_size: int = 1 << 20
+) -> Iterator[npt.NDArray[np.uint64]]:
+    """
+    Stream F(start) .. F(stop - 1) modulo mod in chunks.  A single buffer is reused for every
+    chunk, so memory stays at chunk_size terms however long the run; copy a chunk to keep it.
+
+    Args:
+        start (int): Index of the first term
+        stop (int): Index to stop at
+        mod (int): Modulus, in [1, 2^64)
+        chunk_size (int, optional): Terms per chunk. Defaults to 2^20.
+
+    Returns:
+        Iterator[np.array]: Views of the reused uint64 buffer
+    """
+
+    if not 1 <= mod <= int(UINT64_MAX):
+        raise ValueError(f"Expect modulus in [1, 2^64), got {mod}")
+
+    a, b = (np.uint64(value) for value in _fib_pair_mod(start, mod))
+    buffer = np.empty(chunk_size, dtype=np.uint64)
+    modulus = np.uint64(mod)
+
+    for chunk_start in range(start, stop, chunk_size):
+        chunk = buffer[: min(chunk_size, stop - chunk_start)]
+        # Numba hands scalars back as Python ints - re-wrap so the next call stays uint64
+        a, b = (np.uint64(value) for value in fib_fill_mod(chunk, a, b, modulus))
+        yield chunk
+
+
+def main():
+    """
+    Module run method.
+    """
+
+    n = 10_000_000
+    p = 1_000_000_007
+
+    # Pure Python modular sequence for reference
+    start = time.perf_counter()
+    a, b = 0, 1
+    python_seq = []
+    for _ in range(n):
+        python_seq.append(a)
+        a, b = b, (a + b) % p
+    end = time.perf_counter()
+    print(f"Time to compute {n} terms mod p in Python: {end-start:.03f} seconds")
+
+    # Numba - compilation (or loading the on-disk cache) happens here
+    start = time.perf_counter()
+    fib_sequence(10, p)
+    end = time.perf_counter()
+    print(f"Time to compile fib_fill_mod: {end-start:.03f} seconds")
+
+    start = time.perf_counter()
+    numba_seq = fib_sequence(n, p)
+    end = time.perf_counter()
+    print(f"Time to compute {n} terms mod p with Numba: {end-start:.03f} seconds")
+    assert numba_seq.tolist() == python_seq
+
+    # Billions of terms, streamed through a reused buffer
+    total = 1_000_000_000
+    checksum = np.uint64(0)
+    start = time.perf_counter()
+    for chunk in fib_mod_chunks(0, total, p):
+        checksum ^= np.bitwise_xor.reduce(chunk)
+    end = time.perf_counter()
+    print(f"Time to stream {total} terms mod p: {end-start:.03f} seconds (xor {checksum})")
+
+    # Exact sequence falls back to Python ints past F(93)
+    exact = fib_sequence(100)
+    print(f"fib_sequence(100) dtype: {exact.dtype}, F(99) = {exact[99]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Import time benchmarks guarding the project's startup cost.  Each module is imported in a fresh
+interpreter under `python -X importtime` from an empty working directory, and checked for
+regressions: taking longer than its budget, pulling in a heavy dependency that should be loaded
+lazily, or having import-time side effects such as printing or creating files.  Exits with
+status 1 when any check fails.
+
+Class(es):
+    StartupResult
+
+Function(s):
+    import_times(str, str) -> tuple[dict[str, tuple[int, int]], str, list[str]]
+    measure_startup(str, str, int) -> StartupResult
+    main() -> None
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Dependencies too slow to import for a module that might not need them
+HEAVY_MODULES = ("numpy", "numba", "llvmlite", "pandas", "pandas_datareader", "scipy")
+
+# Modules guarded, as (directory, module, budget in milliseconds).  Budgets leave room for a
+# slow or busy machine: the decorators supporting async functions import asyncio, ~50 ms on its
+# own, while importing numpy takes ~100 ms and numba ~400 ms.
+MODULES = [
+    *(("Decorators", path.stem, 150.0) for path in sorted((ROOT / "Decorators").glob("*.py"))),
+    ("Numerical", "lazy_imports", 50.0),
+    ("Numerical", "numba_testing", 50.0),
+]
+
+# Imported eagerly for reference, to show what the lazy imports save
+REFERENCES = [("Numerical", "numpy"), ("Numerical", "numba")]
+
+
+@dataclass(frozen=True)
+class StartupResult:
+    """
+    Import time of a module, measured over several fresh interpreters.
+
+    Instance Attributes:
+        module (str): Module name
+        median (float): Median cumulative import time in milliseconds
+        best (float): Fastest cumulative import time in milliseconds
+        heavy (tuple[str, ...]): Heavy dependencies the import loaded
+        output (str): What the import printed
+        files (tuple[str, ...]): Files the import created in the working directory
+    """
+
+    module: str
+    median: float
+    best: float
+    heavy: tuple[str, ...]
+    output: str
+    files: tuple[str, ...]
+
+
+def import_times(directory: str, module: str) -> tuple[dict[str, tuple[int, int]], str, list[str]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.  The module's directory is put on
+    PYTHONPATH and the interpreter runs in an empty temporary directory, so files the import
+    creates can be spotted.
+
+    Args:
+        directory (str): Directory holding the module, relative to the project root
+        module (str): Module name
+
+    Raises:
+        RuntimeError: The import failed
+
+    Returns:
+        tuple: Self and cumulative microseconds of every module imported, by name, what the
+            import printed, and the files it created
+    """
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT / directory))
+    with tempfile.TemporaryDirectory() as cwd:
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        files = sorted(os.listdir(cwd))
+
+    times = {}
+    for line in process.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+
+    if process.returncode:
+        raise RuntimeError(f"import {module} failed:\n{process.stderr[-2000:]}")
+
+    return times, process.stdout, files
+
+
+def measure_startup(directory: str, module: str, repeats: int = 5) -> StartupResult:
+    """
+    Measure a module's cumulative import time over several fresh interpreters.
+
+    Args:
+        directory (str): Directory holding the module, relative to the project root
+        module (str): Module name
+        repeats (int, optional): Interpreters started. Defaults to 5.
+
+    Returns:
+        StartupResult: The timings and side effects
+    """
+
+    cumulative = []
+    for _ in range(repeats):
+        times, output, files = import_times(directory, module)
+        cumulative.append(times[module][1] / 1e3)
+
+    return StartupResult(
+        module=module,
+        median=statistics.median(cumulative),
+        best=min(cumulative),
+        heavy=tuple(name for name in HEAVY_MODULES if name in times and name != module),
+        output=output,
+        files=tuple(files),
+    )
+
+
+def main():
+    """
+    Module run method.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    for directory, module in REFERENCES:
+        result = measure_startup(directory, module, repeats=3)
+        print(f"{module:>20}: {result.median:7.1f} ms median (reference, imported eagerly)")
+
+    failures = []
+    for directory, module, budget in MODULES:
+        result = measure_startup(directory, module)
+        print(
+            f"{module:>20}: {result.median:7.1f} ms median, {result.best:7.1f} ms best, "
+            f"budget {budget:.0f} ms"
+        )
+
+        if result.median > budget:
+            failures.append(f"{module} took {result.median:.1f} ms, over {budget:.0f} ms")
+        if result.heavy:
+            failures.append(f"{module} imported {', '.join(result.heavy)}")
+        if result.output:
+            failures.append(f"{module} printed {result.output[:60]!r} when imported")
+        if result.files:
+            failures.append(f"{module} created {', '.join(result.files)} when imported")
+
+    if failures:
+        print("\nStartup regressions:")
+        for failure in failures:
+            print(f"    {failure}")
+        sys.exit(1)
+
+    print("\nNo startup regressions")
+
+
+if __name__ == "__main__":
+    main()